@@ -1,5 +1,6 @@
 import google as genai
 import os
+from config_loader import get_config
 
 def analyze_logs(logs):
     api_key = os.getenv("GEMINI_API_KEY")
@@ -9,7 +10,9 @@ def analyze_logs(logs):
     genai.configure(api_key=api_key)
     model = genai.GenerativeModel('gemini-2.5-flash-lite')
     
-    log_text = "\n".join(logs)
+    # Only send up to the configured number of logs to keep the prompt bounded
+    max_logs = get_config().get_max_logs_to_analyze()
+    log_text = "\n".join(logs[:max_logs])
     prompt = f"""
     You are a security expert analyzing system logs.
     Please analyze the following log entries and identify any suspicious activities, errors, or notable patterns.
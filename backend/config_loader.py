@@ -7,6 +7,12 @@ from pathlib import Path
 from typing import Dict, Any, List
 import logging
 
+# Use the libyaml C loader when PyYAML was built with it
+try:
+    from yaml import CSafeLoader as _YamlLoader
+except ImportError:
+    from yaml import SafeLoader as _YamlLoader
+
 logger = logging.getLogger(__name__)
 
 
@@ -17,6 +23,7 @@ class Config:
         """Initialize configuration with optional config dictionary"""
         self.config = config_dict or {}
         self._apply_defaults()
+        self._build_lookup()
         self._validate()
     
     def _apply_defaults(self):
@@ -64,13 +71,24 @@ class Config:
         self.config = self._deep_merge(defaults, self.config)
     
     def _deep_merge(self, default: Dict, override: Dict) -> Dict:
-        """Deep merge two dictionaries"""
+        """
+        Deep merge two dictionaries
+        
+        Walks the override iteratively; only dictionaries present in both
+        inputs are copied, other values are referenced as-is.
+        """
         result = default.copy()
-        for key, value in override.items():
-            if key in result and isinstance(result[key], dict) and isinstance(value, dict):
-                result[key] = self._deep_merge(result[key], value)
-            else:
-                result[key] = value
+        stack = [(result, override)]
+        while stack:
+            target, source = stack.pop()
+            for key, value in source.items():
+                current = target.get(key)
+                if isinstance(current, dict) and isinstance(value, dict):
+                    merged = current.copy()
+                    target[key] = merged
+                    stack.append((merged, value))
+                else:
+                    target[key] = value
         return result
     
     def _validate(self):
@@ -90,29 +108,51 @@ class Config:
         strategy = self.get('logs.host_detection', 'filename')
         if strategy not in valid_strategies:
             logger.warning(f"Invalid host_detection strategy: {strategy}. Using 'filename'")
-            self.config['logs']['host_detection'] = 'filename'
+            self.set('logs.host_detection', 'filename')
         
         # Validate port number
         port = self.get('server.port', 8000)
         if not isinstance(port, int) or port < 1 or port > 65535:
             logger.warning(f"Invalid port number: {port}. Using 8000")
-            self.config['server']['port'] = 8000
+            self.set('server.port', 8000)
+    
+    def _build_lookup(self):
+        """Build the flat dot-notation lookup table served by get()"""
+        flat = {}
+        stack = [('', self.config)]
+        while stack:
+            prefix, node = stack.pop()
+            for key, value in node.items():
+                if not isinstance(key, str):
+                    continue
+                path = prefix + key
+                flat[path] = value
+                if isinstance(value, dict):
+                    stack.append((path + '.', value))
+        self._flat = flat
     
     def get(self, key_path: str, default: Any = None) -> Any:
         """
         Get configuration value using dot notation
         Example: config.get('logs.directories')
         """
-        keys = key_path.split('.')
-        value = self.config
-        
-        for key in keys:
-            if isinstance(value, dict) and key in value:
-                value = value[key]
-            else:
-                return default
+        return self._flat.get(key_path, default)
+    
+    def set(self, key_path: str, value: Any):
+        """
+        Set configuration value using dot notation
+        Example: config.set('server.port', 9000)
         
-        return value
+        Use this instead of modifying self.config directly so get() stays in sync.
+        """
+        keys = key_path.split('.')
+        target = self.config
+        for key in keys[:-1]:
+            if not isinstance(target.get(key), dict):
+                target[key] = {}
+            target = target[key]
+        target[keys[-1]] = value
+        self._build_lookup()
     
     def get_log_base_dir(self) -> str:
         """Get log base directory"""
@@ -188,7 +228,7 @@ def load_config(config_path: str = None) -> Config:
     
     try:
         with open(config_path, 'r', encoding='utf-8') as f:
-            config_dict = yaml.safe_load(f)
+            config_dict = yaml.load(f, Loader=_YamlLoader)
         
         logger.info(f"Loaded configuration from: {config_path}")
         return Config(config_dict)
@@ -226,12 +266,12 @@ def load_config_with_env_override(config_path: str = None) -> Config:
     # Override with environment variables
     if 'LOG_DIRECTORIES' in os.environ:
         dirs = os.environ['LOG_DIRECTORIES'].split(',')
-        config.config['logs']['directories'] = [d.strip() for d in dirs]
+        config.set('logs.directories', [d.strip() for d in dirs])
     
     # Apply base directory to log directories
     if base_dir:
         base_path = Path(base_dir)
-        original_dirs = config.config['logs']['directories']
+        original_dirs = config.get('logs.directories')
         
         # If directories is the default value or empty, use base_dir itself
         # This handles cases like LOG_BASE_DIR=/var/log/remote/ where host directories are inside
@@ -241,10 +281,10 @@ def load_config_with_env_override(config_path: str = None) -> Config:
             # When using base_dir directly, enable recursive scanning and directory-based host detection
             # unless explicitly overridden
             if 'LOG_RECURSIVE' not in os.environ:
-                config.config['logs']['recursive'] = True
+                config.set('logs.recursive', True)
                 logger.info("Enabled recursive scanning for base_dir mode")
             if 'LOG_HOST_DETECTION' not in os.environ:
-                config.config['logs']['host_detection'] = 'directory'
+                config.set('logs.host_detection', 'directory')
                 logger.info("Set host_detection to 'directory' for base_dir mode")
         else:
             resolved_dirs = []
@@ -257,22 +297,22 @@ def load_config_with_env_override(config_path: str = None) -> Config:
                 else:
                     resolved_dirs.append(str(base_path / log_path))
         
-        config.config['logs']['directories'] = resolved_dirs
-        config.config['logs']['base_dir'] = base_dir
+        config.set('logs.directories', resolved_dirs)
+        config.set('logs.base_dir', base_dir)
         logger.info(f"Using base_dir: {base_dir}")
         logger.info(f"Resolved log directories: {resolved_dirs}")
     
     if 'LOG_RECURSIVE' in os.environ:
-        config.config['logs']['recursive'] = os.environ['LOG_RECURSIVE'].lower() == 'true'
+        config.set('logs.recursive', os.environ['LOG_RECURSIVE'].lower() == 'true')
     
     if 'SERVER_PORT' in os.environ:
         try:
-            config.config['server']['port'] = int(os.environ['SERVER_PORT'])
+            config.set('server.port', int(os.environ['SERVER_PORT']))
         except ValueError:
             logger.warning(f"Invalid SERVER_PORT environment variable: {os.environ['SERVER_PORT']}")
     
     if 'GEMINI_MODEL' in os.environ:
-        config.config['ai']['gemini']['model'] = os.environ['GEMINI_MODEL']
+        config.set('ai.gemini.model', os.environ['GEMINI_MODEL'])
     
     return config
 
@@ -4,17 +4,115 @@ Supports multiple directories, recursive scanning, and file pattern matching
 """
 import os
 import re
+import heapq
+import threading
+import time
+from collections import Counter, OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from functools import lru_cache
+from itertools import chain
 from pathlib import Path
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Iterator, Optional, Tuple
 import fnmatch
 import logging
 
 logger = logging.getLogger(__name__)
 
 
+@lru_cache(maxsize=32)
+def _compile_glob_patterns(patterns: Tuple[str, ...]) -> re.Pattern:
+    """
+    Compile glob patterns into a single regex matching any of them
+    
+    Memoized on the pattern tuple, so rescans and new parser instances
+    reuse the compiled regex. Like fnmatch.fnmatch, callers pass patterns
+    and names through os.path.normcase, so matching is case-insensitive on
+    Windows. An empty pattern tuple yields a regex that never matches.
+    """
+    if not patterns:
+        return re.compile(r'(?!)')
+    return re.compile('|'.join(fnmatch.translate(pattern) for pattern in patterns))
+
+
+def _iter_dir_files(directory: str, recursive: bool) -> Iterator[os.DirEntry]:
+    """
+    Yield directory entries of regular files under a directory
+    
+    Uses os.scandir so file type and stat results come from the directory
+    entry. Symlinked directories are not descended into.
+    """
+    stack = [directory]
+    while stack:
+        try:
+            with os.scandir(stack.pop()) as entries:
+                for entry in entries:
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            if recursive:
+                                stack.append(entry.path)
+                        elif entry.is_file():
+                            yield entry
+                    except OSError:
+                        continue
+        except OSError as e:
+            logger.error(f"Error scanning directory: {e}")
+
+
+# Regex for Syslog format: Nov 26 12:00:01 host1 process[pid]: message
+_SYSLOG_PATTERN = re.compile(
+    r'^([A-Z][a-z]{2}\s+\d+\s\d{2}:\d{2}:\d{2})\s+(\S+)\s+([^:]+):\s+(.+)$'
+)
+# Regex for ISO 8601 syslog format: 2025-12-17T16:13:08+00:00 RHEL-FRONT tailscaled[926]: message
+_ISO8601_SYSLOG_PATTERN = re.compile(
+    r'^(\d{4}-\d{2}-\d{2}T\d{2}:\d{2}:\d{2}[+-]\d{2}:\d{2})\s+(\S+)\s+(\S+?)(?:\[(\d+)\])?:\s+(.+)$'
+)
+# Regex for key-value format: 2025-12-17T23:00:19.900707+09:00 host=LOGS app=rsyslogd pid=- msg= message
+_KEYVALUE_PATTERN = re.compile(
+    r'^(\d{4}-\d{2}-\d{2}T\d{2}:\d{2}:\d{2}(?:\.\d+)?[+-]\d{2}:\d{2})\s+host=(\S+)\s+app=(\S+)\s+pid=(\S+)\s+msg=\s*(.*)$'
+)
+# Regex for ISO format (fallback)
+_ISO_PATTERN = re.compile(
+    r'(\d{4}-\d{2}-\d{2}\s+\d{2}:\d{2}:\d{2})\s+(INFO|WARN|ERROR|DEBUG)\s+(\S+):\s+(.+)'
+)
+
+# All formats combined into one alternation so each line is scanned once.
+# Order matters: earlier alternatives take precedence.
+_FORMATS = [
+    ('iso8601', _ISO8601_SYSLOG_PATTERN),
+    ('keyvalue', _KEYVALUE_PATTERN),
+    ('syslog', _SYSLOG_PATTERN),
+    ('iso', _ISO_PATTERN),
+]
+_COMBINED_PATTERN = re.compile(
+    '|'.join(f'(?P<{name}>{pattern.pattern})' for name, pattern in _FORMATS)
+)
+# Offset of each format's first field within match.groups()
+_GROUP_OFFSETS = {
+    name: (_COMBINED_PATTERN.groupindex[name], pattern.groups)
+    for name, pattern in _FORMATS
+}
+
+# Seconds a file list is used without checking directory mtimes, so one
+# request (and clients polling faster than this) walk the directories once
+_FILES_CACHE_TTL = 2.0
+
+# Number of parsed entries kept in memory per parser, summed over files
+# (least recently used files are dropped first)
+_PARSE_CACHE_MAX_ENTRIES = 500_000
+
+
 class LogParser:
     """Parse log files based on configuration"""
     
+    # Patterns are compiled once at import time and shared by all instances
+    syslog_pattern = _SYSLOG_PATTERN
+    iso8601_syslog_pattern = _ISO8601_SYSLOG_PATTERN
+    keyvalue_pattern = _KEYVALUE_PATTERN
+    iso_pattern = _ISO_PATTERN
+    combined_pattern = _COMBINED_PATTERN
+    _group_offsets = _GROUP_OFFSETS
+    
     def __init__(self, config):
         """
         Initialize log parser with configuration
@@ -23,22 +121,41 @@ class LogParser:
             config: Config object from config_loader
         """
         self.config = config
-        # Regex for Syslog format: Nov 26 12:00:01 host1 process[pid]: message
-        self.syslog_pattern = re.compile(
-            r'^([A-Z][a-z]{2}\s+\d+\s\d{2}:\d{2}:\d{2})\s+(\S+)\s+([^:]+):\s+(.+)$'
-        )
-        # Regex for ISO 8601 syslog format: 2025-12-17T16:13:08+00:00 RHEL-FRONT tailscaled[926]: message
-        self.iso8601_syslog_pattern = re.compile(
-            r'^(\d{4}-\d{2}-\d{2}T\d{2}:\d{2}:\d{2}[+-]\d{2}:\d{2})\s+(\S+)\s+(\S+?)(?:\[(\d+)\])?:\s+(.+)$'
-        )
-        # Regex for key-value format: 2025-12-17T23:00:19.900707+09:00 host=LOGS app=rsyslogd pid=- msg= message
-        self.keyvalue_pattern = re.compile(
-            r'^(\d{4}-\d{2}-\d{2}T\d{2}:\d{2}:\d{2}(?:\.\d+)?[+-]\d{2}:\d{2})\s+host=(\S+)\s+app=(\S+)\s+pid=(\S+)\s+msg=\s*(.*)$'
-        )
-        # Regex for ISO format (fallback)
-        self.iso_pattern = re.compile(
-            r'(\d{4}-\d{2}-\d{2}\s+\d{2}:\d{2}:\d{2})\s+(INFO|WARN|ERROR|DEBUG)\s+(\S+):\s+(.+)'
-        )
+        # find_log_files() result, reused while directory mtimes are unchanged
+        self._files_cache = None
+        self._files_cache_mtimes = None
+        # time.monotonic() of the last mtime check of the cached file list
+        self._files_cache_checked = 0.0
+        # (file list, sorted host names) of the last get_all_hosts() call
+        self._hosts_cache = None
+        # Parsed entries per file: path -> ((size, mtime_ns), logs), in LRU order
+        self._parse_cache = OrderedDict()
+        # Total number of entries in _parse_cache; both are guarded by the lock
+        self._parse_cache_entries = 0
+        self._parse_cache_lock = threading.Lock()
+    
+    def _detect_level(self, message: str, detect_debug: bool = True) -> str:
+        """
+        Determine log level from message content
+        Example: "Authentication failed" -> "ERROR"
+        
+        ERROR keywords win over WARN, and WARN over DEBUG. The message is
+        lowercased once and searched with str.__contains__, which for four
+        short keywords is several times faster than a case-insensitive regex.
+        
+        Args:
+            message: Log message
+            detect_debug: Whether "debug" in the message means DEBUG; the
+                traditional syslog format only recognizes ERROR and WARN
+        """
+        lowered = message.lower()
+        if 'error' in lowered or 'fail' in lowered:
+            return "ERROR"
+        if 'warn' in lowered:
+            return "WARN"
+        if detect_debug and 'debug' in lowered:
+            return "DEBUG"
+        return "INFO"
     
     def _parse_process_and_level(self, process_str, message):
         """
@@ -50,11 +167,11 @@ class LogParser:
         pid = None
         level = "INFO"
         
-        # Check for PID or Level in brackets
-        match = re.match(r'^(.*?)\[(.*?)\]$', process_str)
-        if match:
-            process = match.group(1)
-            content = match.group(2)
+        # Check for PID or Level in brackets (split at the first "[")
+        bracket = process_str.find('[') if process_str.endswith(']') else -1
+        if bracket != -1:
+            process = process_str[:bracket]
+            content = process_str[bracket + 1:-1]
             
             if content.isdigit():
                 pid = content
@@ -63,28 +180,64 @@ class LogParser:
         
         # If level not found in process, check message
         if level == "INFO":
-            if "error" in message.lower() or "fail" in message.lower():
-                level = "ERROR"
-            elif "warn" in message.lower():
-                level = "WARN"
-                
+            level = self._detect_level(message, detect_debug=False)
+        
         return process, pid, level
 
-    def find_log_files(self) -> Dict[str, List[Path]]:
+    def _get_directory_mtimes(self, directories: List[str], recursive: bool) -> Dict[str, int]:
         """
-        Find all log files based on configuration
+        Get modification times of the scanned directories
+        
+        Adding or removing a file updates the mtime of its parent directory, so
+        these are enough to tell whether the file list may have changed. In
+        recursive mode every subdirectory the scan would descend into is
+        included as well, so files added at any depth are noticed.
+        
+        Args:
+            directories: Configured log directories
+            recursive: Whether subdirectories are scanned
         
         Returns:
-            Dictionary mapping host names to list of log file paths
+            Dictionary mapping directory path to st_mtime_ns (-1 if missing)
+        """
+        mtimes = {}
+        for directory in directories:
+            try:
+                mtimes[directory] = os.stat(directory).st_mtime_ns
+            except OSError:
+                mtimes[directory] = -1
+                continue
+            
+            # Same traversal as _iter_dir_files: symlinked directories are skipped
+            stack = [directory] if recursive else []
+            while stack:
+                try:
+                    with os.scandir(stack.pop()) as entries:
+                        for entry in entries:
+                            if entry.is_dir(follow_symlinks=False):
+                                mtimes[entry.path] = entry.stat(follow_symlinks=False).st_mtime_ns
+                                stack.append(entry.path)
+                except OSError:
+                    continue
+        return mtimes
+    
+    def iter_log_files(self) -> Iterator[Tuple[str, Path]]:
+        """
+        Scan the configured directories and yield log files as they are found
+        
+        Unlike find_log_files() this is not cached, and callers can stop early.
+        
+        Yields:
+            Tuples of (host name, log file path)
         """
-        log_files = {}
         directories = self.config.get_log_directories()
         recursive = self.config.is_recursive()
-        include_patterns = self.config.get_include_patterns()
-        exclude_patterns = self.config.get_exclude_patterns()
+        normcase = os.path.normcase
+        include_match = _compile_glob_patterns(tuple(map(normcase, self.config.get_include_patterns()))).match
+        exclude_match = _compile_glob_patterns(tuple(map(normcase, self.config.get_exclude_patterns()))).match
         max_size_mb = self.config.get_max_file_size_mb()
         max_size_bytes = max_size_mb * 1024 * 1024
-        host_detection = self.config.get_host_detection_strategy()
+        strategy = self.config.get_host_detection_strategy()
         
         for directory in directories:
             dir_path = Path(directory)
@@ -93,54 +246,82 @@ class LogParser:
                 logger.warning(f"Directory does not exist: {directory}")
                 continue
             
-            # Find files
-            if recursive:
-                pattern = '**/*'
-            else:
-                pattern = '*'
-            
-            for file_path in dir_path.glob(pattern):
-                if not file_path.is_file():
+            for entry in _iter_dir_files(directory, recursive):
+                name = normcase(entry.name)
+                
+                # Check include patterns
+                if not include_match(name):
+                    continue
+                
+                # Check exclude patterns
+                if exclude_match(name):
                     continue
                 
                 # Check file size
                 try:
-                    if file_path.stat().st_size > max_size_bytes:
-                        logger.warning(f"File too large, skipping: {file_path}")
+                    if entry.stat().st_size > max_size_bytes:
+                        logger.warning(f"File too large, skipping: {entry.path}")
                         continue
                 except OSError as e:
-                    logger.error(f"Error checking file size: {file_path}, {e}")
-                    continue
-                
-                # Check include patterns
-                if not any(fnmatch.fnmatch(file_path.name, pattern) for pattern in include_patterns):
+                    logger.error(f"Error checking file size: {entry.path}, {e}")
                     continue
                 
-                # Check exclude patterns
-                if any(fnmatch.fnmatch(file_path.name, pattern) for pattern in exclude_patterns):
-                    continue
+                file_path = Path(entry.path)
                 
                 # Determine host name
-                host = self._get_host_name(file_path, dir_path)
-                
-                if host not in log_files:
-                    log_files[host] = []
-                log_files[host].append(file_path)
+                yield self._get_host_name(file_path, dir_path, strategy), file_path
+    
+    def find_log_files(self) -> Dict[str, List[Path]]:
+        """
+        Find all log files based on configuration
+        
+        The result is cached until one of the scanned directories changes.
+        Directory mtimes are checked at most every _FILES_CACHE_TTL seconds,
+        so files added in the meantime show up after that delay.
         
+        Returns:
+            Dictionary mapping host names to list of log file paths
+        """
+        log_files = self._files_cache
+        checked = time.monotonic()
+        if log_files is not None and checked - self._files_cache_checked < _FILES_CACHE_TTL:
+            return log_files
+        
+        directories = self.config.get_log_directories()
+        recursive = self.config.is_recursive()
+        
+        mtimes = self._get_directory_mtimes(directories, recursive)
+        if log_files is not None and mtimes == self._files_cache_mtimes:
+            self._files_cache_checked = checked
+            return log_files
+        
+        log_files = {}
+        for host, file_path in self.iter_log_files():
+            if host not in log_files:
+                log_files[host] = []
+            log_files[host].append(file_path)
+        
+        self._files_cache = log_files
+        self._files_cache_mtimes = mtimes
+        self._files_cache_checked = checked
+        self._hosts_cache = None
         return log_files
     
-    def _get_host_name(self, file_path: Path, base_dir: Path) -> str:
+    def _get_host_name(self, file_path: Path, base_dir: Path, strategy: Optional[str] = None) -> str:
         """
         Determine host name based on configuration strategy
         
         Args:
             file_path: Path to log file
             base_dir: Base directory path
+            strategy: Host detection strategy, looked up in the config if None;
+                directory scans resolve it once instead of per file
         
         Returns:
             Host name string
         """
-        strategy = self.config.get_host_detection_strategy()
+        if strategy is None:
+            strategy = self.config.get_host_detection_strategy()
         
         if strategy == 'filename':
             # Use filename without extension as host
@@ -162,149 +343,308 @@ class LogParser:
         else:
             # Default to filename
             return file_path.stem
-
+    
+    def _get_file_cache_key(self, file_path: Path) -> Optional[Tuple[int, int]]:
+        """
+        Get the (size, mtime_ns) key used to cache a parsed file
+        
+        The size limit is checked here as well as during the directory scan,
+        since a file in the cached file list may have grown since then.
+        
+        Returns:
+            Cache key, or None if the file cannot be accessed or is too large
+        """
+        try:
+            stat = file_path.stat()
+        except OSError as e:
+            logger.error(f"Error parsing log file {file_path}: {e}")
+            return None
+        if stat.st_size > self.config.get_max_file_size_mb() * 1024 * 1024:
+            logger.warning(f"File too large, skipping: {file_path}")
+            self._uncache_logs(file_path)
+            return None
+        return (stat.st_size, stat.st_mtime_ns)
+    
+    def _get_cached_logs(self, file_path: Path, cache_key: Tuple[int, int]) -> Optional[List[Dict[str, Any]]]:
+        """
+        Get the cached entries of a file if it is unchanged since it was parsed
+        
+        Returns:
+            Cached log entries, or None if the file needs parsing
+        """
+        with self._parse_cache_lock:
+            cached = self._parse_cache.get(file_path)
+            if cached is None or cached[0] != cache_key:
+                return None
+            self._parse_cache.move_to_end(file_path)
+            return cached[1]
+    
+    def _cache_logs(self, file_path: Path, cache_key: Tuple[int, int], logs: List[Dict[str, Any]]):
+        """
+        Cache the entries of a parsed file
+        
+        Least recently used files are dropped while the cache holds more than
+        _PARSE_CACHE_MAX_ENTRIES entries; the newest file is always kept.
+        """
+        with self._parse_cache_lock:
+            previous = self._parse_cache.pop(file_path, None)
+            if previous is not None:
+                self._parse_cache_entries -= len(previous[1])
+            self._parse_cache[file_path] = (cache_key, logs)
+            self._parse_cache_entries += len(logs)
+            while self._parse_cache_entries > _PARSE_CACHE_MAX_ENTRIES and len(self._parse_cache) > 1:
+                _, (_, evicted) = self._parse_cache.popitem(last=False)
+                self._parse_cache_entries -= len(evicted)
+    
+    def _uncache_logs(self, file_path: Path):
+        """Drop the cached entries of a file, if any"""
+        with self._parse_cache_lock:
+            previous = self._parse_cache.pop(file_path, None)
+            if previous is not None:
+                self._parse_cache_entries -= len(previous[1])
+    
     def parse_log_file(self, file_path: Path) -> List[Dict[str, Any]]:
         """
         Parse a single log file
         
+        Parsed entries are cached per file and reused until the file's size or
+        mtime changes, so the returned list must not be modified.
+        
         Args:
             file_path: Path to log file
         
         Returns:
             List of parsed log entries
         """
+        cache_key = self._get_file_cache_key(file_path)
+        if cache_key is None:
+            return []
+        
+        cached = self._get_cached_logs(file_path, cache_key)
+        if cached is not None:
+            return cached
+        
+        logs, complete = self._parse_file(file_path)
+        if complete:
+            self._cache_logs(file_path, cache_key, logs)
+        return logs
+    
+    def parse_log_files(self, file_paths: List[Path]) -> Iterator[List[Dict[str, Any]]]:
+        """
+        Parse several log files, using a thread pool for uncached files
+        
+        When more than one file needs parsing they are parsed on threads so
+        their reads overlap. Worker processes are not used: forking the
+        multi-threaded server per request risks deadlocked children, and
+        shipping every parsed entry back costs about as much as the parse.
+        
+        Args:
+            file_paths: Paths to log files
+        
+        Yields:
+            Parsed entries for each file, in the same order
+        """
+        pending = []
+        for file_path in file_paths:
+            cache_key = self._get_file_cache_key(file_path)
+            if cache_key is None:
+                continue
+            if self._get_cached_logs(file_path, cache_key) is None:
+                pending.append((file_path, cache_key))
+        
+        if len(pending) > 1:
+            paths = [file_path for file_path, _ in pending]
+            with ThreadPoolExecutor(max_workers=min(len(paths), 8)) as executor:
+                results = list(executor.map(self._parse_file, paths))
+            for (file_path, cache_key), (logs, complete) in zip(pending, results):
+                if complete:
+                    self._cache_logs(file_path, cache_key, logs)
+        
+        for file_path in file_paths:
+            yield self.parse_log_file(file_path)
+    
+    def _read_lines(self, file_path: Path) -> List[str]:
+        """
+        Read a log file and split it into lines
+        
+        The whole file is read and decoded at once (callers skip files over
+        logs.max_file_size_mb) and split in C; line breaks follow universal
+        newlines like text-mode iteration.
+        
+        Args:
+            file_path: Path to log file
+        
+        Returns:
+            List of lines without line terminators
+        """
+        with open(file_path, 'rb') as f:
+            text = f.read().decode('utf-8', errors='ignore')
+        return text.replace('\r\n', '\n').replace('\r', '\n').split('\n')
+    
+    def _parse_file(self, file_path: Path) -> Tuple[List[Dict[str, Any]], bool]:
+        """
+        Parse a single log file without consulting the cache
+        
+        Args:
+            file_path: Path to log file
+        
+        Returns:
+            Tuple of parsed log entries and whether the whole file was read
+        """
         logs = []
         
+        combined_match = self.combined_pattern.match
+        group_offsets = self._group_offsets
+        # Syslog timestamps carry no year; resolve it once per file
+        current_year = datetime.now().year
+        # Same for every entry of the file
+        service = file_path.stem
+        file_str = str(file_path)
+        
         try:
-            with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
-                for line_num, line in enumerate(f, 1):
-                    line = line.strip()
-                    if not line:
-                        continue
-                    
-                    # Try ISO 8601 syslog format first (e.g., 2025-12-17T16:13:08+00:00 RHEL-FRONT tailscaled[926]: message)
-                    match = self.iso8601_syslog_pattern.match(line)
-                    if match:
-                        timestamp, host, process, pid, message = match.groups()
-                        
-                        # Determine log level from message content
-                        level = "INFO"
-                        if "error" in message.lower() or "fail" in message.lower():
-                            level = "ERROR"
-                        elif "warn" in message.lower():
-                            level = "WARN"
-                        elif "debug" in message.lower():
-                            level = "DEBUG"
-                        
-                        service = file_path.stem
-                        
-                        logs.append({
-                            'timestamp': timestamp,
-                            'level': level,
-                            'process': process,
-                            'service': service,
-                            'message': message,
-                            'raw': line,
-                            'file': str(file_path),
-                            'line_number': line_num,
-                            'host': host,
-                            'pid': pid
-                        })
-                        continue
-                    
-                    # Try key-value format (e.g., 2025-12-17T23:00:19.900707+09:00 host=LOGS app=rsyslogd pid=- msg= message)
-                    match = self.keyvalue_pattern.match(line)
-                    if match:
-                        timestamp, host, process, pid, message = match.groups()
-                        
-                        # Handle "-" as empty pid
-                        if pid == '-':
-                            pid = None
-                        
-                        # Determine log level from message content
-                        level = "INFO"
-                        if "error" in message.lower() or "fail" in message.lower():
-                            level = "ERROR"
-                        elif "warn" in message.lower():
-                            level = "WARN"
-                        elif "debug" in message.lower():
-                            level = "DEBUG"
-                        
-                        service = file_path.stem
-                        
-                        logs.append({
-                            'timestamp': timestamp,
-                            'level': level,
-                            'process': process,
-                            'service': service,
-                            'message': message,
-                            'raw': line,
-                            'file': str(file_path),
-                            'line_number': line_num,
-                            'host': host,
-                            'pid': pid
-                        })
-                        continue
-                    
-                    # Try traditional Syslog format (e.g., Nov 26 12:00:01 host1 process[pid]: message)
-                    match = self.syslog_pattern.match(line)
-                    if match:
-                        timestamp_str, host, process_raw, message = match.groups()
-                        
-                        # Add current year to timestamp if missing
-                        # This is a simplification; ideally we'd handle year rollover
-                        from datetime import datetime
-                        current_year = datetime.now().year
-                        timestamp = f"{current_year} {timestamp_str}"
-                        
-                        process, pid, level = self._parse_process_and_level(process_raw, message)
-                        service = file_path.stem
-                        
-                        logs.append({
-                            'timestamp': timestamp,
-                            'level': level,
-                            'process': process,
-                            'service': service,
-                            'message': message,
-                            'raw': line,
-                            'file': str(file_path),
-                            'line_number': line_num
-                        })
-                        continue
-
-                    # Try simple ISO format (e.g., 2024-01-01 12:00:00 INFO process: message)
-                    match = self.iso_pattern.match(line)
-                    if match:
-                        timestamp, level, process, message = match.groups()
-                        service = file_path.stem
-                        logs.append({
-                            'timestamp': timestamp,
-                            'level': level,
-                            'process': process,
-                            'service': service,
-                            'message': message,
-                            'raw': line,
-                            'file': str(file_path),
-                            'line_number': line_num
-                        })
-                        continue
-                        
+            lines = self._read_lines(file_path)
+            
+            for line_num, line in enumerate(lines, 1):
+                line = line.strip()
+                if not line:
+                    continue
+                
+                match = combined_match(line)
+                if not match:
                     # If line doesn't match pattern, treat as INFO with unknown process
                     logs.append({
                         'timestamp': '',
                         'level': 'INFO',
                         'process': 'unknown',
-                        'service': file_path.stem,
+                        'service': service,
                         'message': line,
                         'raw': line,
-                        'file': str(file_path),
+                        'file': file_str,
+                        'line_number': line_num
+                    })
+                    continue
+                
+                fmt = match.lastgroup
+                offset, count = group_offsets[fmt]
+                fields = match.groups()[offset:offset + count]
+                
+                if fmt == 'iso8601' or fmt == 'keyvalue':
+                    # ISO 8601 syslog (e.g., 2025-12-17T16:13:08+00:00 RHEL-FRONT tailscaled[926]: message)
+                    # or key-value (e.g., 2025-12-17T23:00:19.900707+09:00 host=LOGS app=rsyslogd pid=- msg= message)
+                    timestamp, host, process, pid, message = fields
+                    
+                    # Handle "-" as empty pid
+                    if fmt == 'keyvalue' and pid == '-':
+                        pid = None
+                    
+                    level = self._detect_level(message)
+                    
+                    logs.append({
+                        'timestamp': timestamp,
+                        'level': level,
+                        'process': process,
+                        'service': service,
+                        'message': message,
+                        'raw': line,
+                        'file': file_str,
+                        'line_number': line_num,
+                        'host': host,
+                        'pid': pid
+                    })
+                
+                elif fmt == 'syslog':
+                    # Traditional Syslog (e.g., Nov 26 12:00:01 host1 process[pid]: message)
+                    timestamp_str, host, process_raw, message = fields
+                    
+                    # Add current year to timestamp if missing
+                    # This is a simplification; ideally we'd handle year rollover
+                    timestamp = f"{current_year} {timestamp_str}"
+                    
+                    process, pid, level = self._parse_process_and_level(process_raw, message)
+                    
+                    logs.append({
+                        'timestamp': timestamp,
+                        'level': level,
+                        'process': process,
+                        'service': service,
+                        'message': message,
+                        'raw': line,
+                        'file': file_str,
+                        'line_number': line_num
+                    })
+                
+                else:
+                    # Simple ISO (e.g., 2024-01-01 12:00:00 INFO process: message)
+                    timestamp, level, process, message = fields
+                    logs.append({
+                        'timestamp': timestamp,
+                        'level': level,
+                        'process': process,
+                        'service': service,
+                        'message': message,
+                        'raw': line,
+                        'file': file_str,
                         'line_number': line_num
                     })
         
         except Exception as e:
             logger.error(f"Error parsing log file {file_path}: {e}")
+            return logs, False
         
-        return logs
+        return logs, True
+    
+    def count_log_levels(self, file_path: Path) -> Counter:
+        """
+        Count entries per level in a log file without building log entries
+        
+        Uses the cached entries if the file has already been parsed.
+        
+        Args:
+            file_path: Path to log file
+        
+        Returns:
+            Counter mapping level to number of entries
+        """
+        cache_key = self._get_file_cache_key(file_path)
+        if cache_key is None:
+            return Counter()
+        
+        cached = self._get_cached_logs(file_path, cache_key)
+        if cached is not None:
+            return Counter(log['level'] for log in cached)
+        
+        level_counts = Counter()
+        combined_match = self.combined_pattern.match
+        group_offsets = self._group_offsets
+        
+        try:
+            for line in self._read_lines(file_path):
+                line = line.strip()
+                if not line:
+                    continue
+                
+                match = combined_match(line)
+                if not match:
+                    level_counts['INFO'] += 1
+                    continue
+                
+                fmt = match.lastgroup
+                offset, count = group_offsets[fmt]
+                fields = match.groups()[offset:offset + count]
+                
+                # Same level rules as _parse_file for each format
+                if fmt == 'iso':
+                    level = fields[1]
+                elif fmt == 'syslog':
+                    level = self._parse_process_and_level(fields[2], fields[3])[2]
+                else:
+                    level = self._detect_level(fields[4])
+                level_counts[level] += 1
+        
+        except Exception as e:
+            logger.error(f"Error parsing log file {file_path}: {e}")
+        
+        return level_counts
     
     def get_logs_for_host(self, host: str, limit: int = 1000, offset: int = 0) -> List[Dict[str, Any]]:
         """
@@ -324,52 +664,63 @@ class LogParser:
             logger.warning(f"No log files found for host: {host}")
             return []
         
-        all_logs = []
-        for file_path in log_files_map[host]:
-            logs = self.parse_log_file(file_path)
-            all_logs.extend(logs)
+        all_logs = chain.from_iterable(self.parse_log_files(log_files_map[host]))
         
-        # Sort by timestamp (if available) and apply pagination
-        all_logs.sort(key=lambda x: x.get('timestamp', ''), reverse=True)
-        return all_logs[offset:offset + limit]
+        # Newest first by timestamp (if available); only the entries up to the
+        # requested page are kept instead of sorting everything
+        newest = heapq.nlargest(offset + limit, all_logs, key=lambda x: x.get('timestamp', ''))
+        return newest[offset:]
     
     def get_all_hosts(self) -> List[str]:
         """
         Get list of all available hosts
         
+        The sorted list is kept until the cached file list is refreshed.
+        
         Returns:
             List of host names
         """
-        log_files_map = self.find_log_files()
-        return sorted(log_files_map.keys())
+        log_files = self.find_log_files()
+        # Paired with the mapping it was built from, as another thread may
+        # refresh the file list in between
+        cached = self._hosts_cache
+        if cached is None or cached[0] is not log_files:
+            cached = (log_files, sorted(log_files.keys()))
+            self._hosts_cache = cached
+        return list(cached[1])
     
     def get_stats_for_host(self, host: str) -> Dict[str, Any]:
         """
         Get statistics for a specific host
         
+        Levels are counted over all log files of the host without building
+        log entries. Several files are counted on threads so their reads
+        overlap.
+        
         Args:
             host: Host name
         
         Returns:
             Dictionary with statistics
         """
-        logs = self.get_logs_for_host(host, limit=10000)  # Get more logs for stats
+        log_files_map = self.find_log_files()
         
-        if not logs:
-            return {
-                'total': 0,
-                'info': 0,
-                'warn': 0,
-                'error': 0,
-                'debug': 0
-            }
+        file_paths = log_files_map.get(host, [])
+        level_counts = Counter()
+        if len(file_paths) > 1:
+            with ThreadPoolExecutor(max_workers=min(len(file_paths), 8)) as executor:
+                for counts in executor.map(self.count_log_levels, file_paths):
+                    level_counts.update(counts)
+        else:
+            for file_path in file_paths:
+                level_counts.update(self.count_log_levels(file_path))
         
         stats = {
-            'total': len(logs),
-            'info': sum(1 for log in logs if log['level'] == 'INFO'),
-            'warn': sum(1 for log in logs if log['level'] == 'WARN'),
-            'error': sum(1 for log in logs if log['level'] == 'ERROR'),
-            'debug': sum(1 for log in logs if log['level'] == 'DEBUG')
+            'total': sum(level_counts.values()),
+            'info': level_counts['INFO'],
+            'warn': level_counts['WARN'],
+            'error': level_counts['ERROR'],
+            'debug': level_counts['DEBUG']
         }
         
         return stats
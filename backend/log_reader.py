@@ -1,23 +1,41 @@
+import copy
 import os
 import re
+import numpy as np
 import pandas as pd
-from datetime import datetime
+from datetime import datetime, timedelta, timezone
 from pathlib import Path
 from config_loader import get_config
 
+# Shared parser, so file discovery and parse caches survive across requests
+_parser = None
+
+def get_parser():
+    """Get the shared LogParser, recreated when the configuration object changes"""
+    global _parser
+    config = get_config()
+    if _parser is None or _parser.config is not config:
+        from log_parser import LogParser
+        _parser = LogParser(config)
+    return _parser
+
+def reset_parser():
+    """Drop the shared LogParser and cached stats, e.g. after a configuration reload"""
+    global _parser, _stats_cache
+    _parser = None
+    _stats_cache = {}
+
 def get_hosts():
     """Get list of all available hosts from configured log directories"""
-    config = get_config()
-    from log_parser import LogParser
-    parser = LogParser(config)
-    return parser.get_all_hosts()
+    return get_parser().get_all_hosts()
+
+# Basic syslog format parser (adjust regex based on actual rsyslog format)
+# Example: Nov 26 12:00:01 host1 systemd[1]: Started Session 1 of user root.
+# This is a simplified regex and might need tuning for specific rsyslog templates
+_SYSLOG_RE = re.compile(r"^([A-Z][a-z]{2}\s+\d+\s\d{2}:\d{2}:\d{2})\s(\S+)\s(\S+?)(?:\[(\d+)\])?:\s(.*)$")
 
 def parse_syslog_line(line):
-    # Basic syslog format parser (adjust regex based on actual rsyslog format)
-    # Example: Nov 26 12:00:01 host1 systemd[1]: Started Session 1 of user root.
-    # This is a simplified regex and might need tuning for specific rsyslog templates
-    regex = r"^([A-Z][a-z]{2}\s+\d+\s\d{2}:\d{2}:\d{2})\s(\S+)\s(\S+?)(?:\[(\d+)\])?:\s(.*)$"
-    match = re.match(regex, line)
+    match = _SYSLOG_RE.match(line)
     if match:
         timestamp_str = match.group(1)
         # Add current year as syslog usually doesn't have it, or handle it properly
@@ -28,9 +46,10 @@ def parse_syslog_line(line):
         message = match.group(5)
         
         level = "INFO"
-        if "error" in message.lower() or "fail" in message.lower():
+        message_lower = message.lower()
+        if "error" in message_lower or "fail" in message_lower:
             level = "ERROR"
-        elif "warn" in message.lower():
+        elif "warn" in message_lower:
             level = "WARN"
             
         return {
@@ -45,94 +64,166 @@ def parse_syslog_line(line):
 
 def get_logs(host, limit=100, offset=0):
     """Get logs for a specific host using configuration-based parser"""
-    config = get_config()
-    from log_parser import LogParser
-    parser = LogParser(config)
-    return parser.get_logs_for_host(host, limit, offset)
+    return get_parser().get_logs_for_host(host, limit, offset)
+
+# Timestamp layouts produced by LogParser, tried in this order
+# ISO 8601 with T (e.g., 2025-12-17T23:00:19.900707+09:00)
+_ISO_T_RE = r'^(\d{4}-\d{2}-\d{2}T\d{2}:\d{2}:\d{2})(?:\.\d+)?([+-]\d{2}:\d{2})?'
+# Syslog with year prepended by the parser (e.g., "2025 Nov 26 14:23:30")
+_YEAR_SYSLOG_RE = r'^\s*(\d{4}\s+\S+\s+\d+\s+\d+:\d+:\d+)(?:\s|$)'
+# Plain syslog (e.g., "Nov 26 12:00:01")
+_SYSLOG_TS_RE = r'^\s*(\S+\s+\d+\s+\d+:\d+:\d+)(?:\s|$)'
+
+# Local time zone that offset-aware timestamps are converted to
+_JST = timezone(timedelta(hours=9))
+
+# Parsed timestamps keyed on the raw string, shared across stats requests
+_TIMESTAMP_CACHE_SIZE = 1 << 16
+_timestamp_cache = {}
+_timestamp_cache_year = None
+
+def _parse_timestamps(timestamps):
+    """Parse a Series of timestamp strings in any supported format, NaT where invalid"""
+    global _timestamp_cache, _timestamp_cache_year
+    
+    # Syslog timestamps without a year depend on the current year. The cache
+    # is shared by request threads, so it is replaced rather than cleared and
+    # each call works on the dict it picked up here
+    cache = _timestamp_cache
+    current_year = datetime.now().year
+    if current_year != _timestamp_cache_year:
+        cache = _timestamp_cache = {}
+        _timestamp_cache_year = current_year
+    
+    # Identical timestamps are common in bursty logs, so each distinct string is parsed once
+    codes, uniques = pd.factorize(timestamps.fillna('').astype(str))
+    found = {ts: cache.get(ts) for ts in uniques}
+    missing = [ts for ts, value in found.items() if value is None]
+    if missing:
+        parsed = dict(zip(missing, _parse_timestamp_strings(pd.Series(missing, dtype=object)).to_numpy()))
+        found.update(parsed)
+        if len(cache) + len(parsed) > _TIMESTAMP_CACHE_SIZE:
+            cache = _timestamp_cache = {}
+        cache.update(parsed)
+    
+    values = np.array([found[ts] for ts in uniques], dtype='datetime64[ns]')
+    return pd.Series(values[codes], index=timestamps.index)
+
+def _parse_timestamp_strings(ts):
+    """Parse a Series of distinct timestamp strings"""
+    result = pd.Series(pd.NaT, index=ts.index, dtype='datetime64[ns]')
+    rest = ts != ''
+
+    # ISO 8601 with T - convert to local time (JST is +09:00) when an offset is present
+    iso = ts[rest].str.extract(_ISO_T_RE)
+    iso_mask = iso[0].notna()
+    if iso_mask.any():
+        iso = iso[iso_mask]
+        has_offset = iso[1].notna()
+        naive = iso[0][~has_offset]
+        result[naive.index] = pd.to_datetime(naive, format='ISO8601', errors='coerce')
+        aware = pd.to_datetime(iso[0][has_offset] + iso[1][has_offset], format='ISO8601', errors='coerce', utc=True)
+        result[aware.index] = aware.dt.tz_convert(_JST).dt.tz_localize(None)
+        rest[iso.index] = False
+
+    # Simple ISO format (YYYY-MM-DD HH:MM:SS)
+    simple = rest & ts.str.contains('-', regex=False) & ts.str.contains(':', regex=False)
+    if simple.any():
+        result[simple] = pd.to_datetime(ts[simple], format='%Y-%m-%d %H:%M:%S', errors='coerce')
+        rest &= ~simple
+
+    # Syslog formats, with the current year added when missing
+    with_year = ts[rest].str.extract(_YEAR_SYSLOG_RE)[0].dropna()
+    rest[with_year.index] = False
+    without_year = ts[rest].str.extract(_SYSLOG_TS_RE)[0].dropna()
+    syslog = pd.concat([with_year, str(datetime.now().year) + ' ' + without_year])
+    if len(syslog):
+        syslog = syslog.str.split().str.join(' ')
+        result[syslog.index] = pd.to_datetime(syslog, format='%Y %b %d %H:%M:%S', errors='coerce')
+
+    return result
+
+# Column of each level in the time-series counts
+_SERIES_LEVELS = ['INFO', 'WARN', 'ERROR']
+
+# Time ranges: (window, slot label format, slot width); unknown ranges fall back to 1h
+_TIME_RANGES = {
+    "1h": (timedelta(hours=1), '%H:%M', timedelta(minutes=1)),
+    "1d": (timedelta(days=1), '%m/%d %H:00', timedelta(hours=1)),
+    "1w": (timedelta(weeks=1), '%m/%d', timedelta(days=1)),
+    "1m": (timedelta(days=30), '%m/%d', timedelta(days=1)),
+}
+
+def _count_levels(levels):
+    """Count a Categorical of levels, most common first, leaving out absent levels"""
+    counts = pd.Series(levels).value_counts()
+    return counts[counts > 0].to_dict()
+
+def get_host_signature(host):
+    """Get (path, mtime_ns, size) of each log file of a host, used to detect log writes"""
+    signature = []
+    for path in get_parser().find_log_files().get(host, []):
+        try:
+            stat = os.stat(path)
+        except OSError:
+            continue
+        signature.append((str(path), stat.st_mtime_ns, stat.st_size))
+    return tuple(signature)
+
+# "all" stats per (host, log file signature); relative ranges move with the clock and are not cached
+_STATS_CACHE_SIZE = 256
+_stats_cache = {}
 
 def get_log_stats(host, time_range="1h"):
     """Get statistics for a specific host using configuration-based parser"""
+    global _stats_cache
+    if time_range != "all":
+        return _compute_log_stats(host, time_range, datetime.now())[0]
+    
+    # Results for the whole log are reused until a log file changes
+    signature = get_host_signature(host)
+    key = (host, signature)
+    cached = _stats_cache.get(key)
+    if cached is not None:
+        return copy.deepcopy(cached)
+    
+    stats, complete = _compute_log_stats(host, time_range, datetime.now())
+    if complete and signature:
+        cache = _stats_cache
+        if len(cache) >= _STATS_CACHE_SIZE:
+            # Replaced rather than cleared, as other request threads may be reading it
+            cache = _stats_cache = {}
+        cache[key] = copy.deepcopy(stats)
+    return stats
+
+def _compute_log_stats(host, time_range, now):
+    """
+    Compute statistics for a host, with relative time ranges ending at now
+    
+    Returns the stats and whether the time series was built without errors.
+    """
     logs = get_logs(host, limit=10000)  # Analyze last 10000 logs for stats
     if not logs:
-        return {"total": 0, "levels": {}, "time_series": [], "filtered_total": 0, "filtered_levels": {}}
+        return {"total": 0, "levels": {}, "time_series": [], "filtered_total": 0, "filtered_levels": {}}, True
     
-    df = pd.DataFrame(logs)
-    level_counts = df["level"].value_counts().to_dict()
+    # Levels as int codes over the few distinct level names
+    levels = pd.Categorical([log.get("level") for log in logs])
+    level_counts = _count_levels(levels)
     
     # Parse timestamps and create time-series data
     time_series = []
     filtered_total = 0
     filtered_levels = {}
+    complete = True
     
     try:
         # Convert timestamp strings to datetime for filtering
-        from datetime import datetime, timedelta
-        import calendar
-        import re
-        
-        def parse_timestamp(ts_str):
-            """Parse various timestamp formats"""
-            if not ts_str or ts_str == '':
-                return None
-            
-            try:
-                # Try ISO 8601 format with T (e.g., 2025-12-17T23:00:19.900707+09:00)
-                if 'T' in ts_str:
-                    # Parse ISO 8601 with timezone
-                    match = re.match(r'(\d{4}-\d{2}-\d{2})T(\d{2}:\d{2}:\d{2})(?:\.\d+)?([+-]\d{2}:\d{2})?', ts_str)
-                    if match:
-                        date_part = match.group(1)
-                        time_part = match.group(2)
-                        tz_part = match.group(3)
-                        dt_str = f"{date_part} {time_part}"
-                        result = datetime.strptime(dt_str, '%Y-%m-%d %H:%M:%S')
-                        
-                        # Adjust for timezone if present - convert to local time (JST)
-                        if tz_part:
-                            tz_sign = 1 if tz_part[0] == '+' else -1
-                            tz_hours = int(tz_part[1:3])
-                            tz_minutes = int(tz_part[4:6])
-                            tz_offset = timedelta(hours=tz_hours, minutes=tz_minutes) * tz_sign
-                            # Convert to UTC then to local time (JST is +09:00)
-                            result_utc = result - tz_offset
-                            jst_offset = timedelta(hours=9)
-                            result = result_utc + jst_offset
-                        
-                        return result
-                
-                # Try simple ISO format (YYYY-MM-DD HH:MM:SS)
-                if '-' in ts_str and ':' in ts_str:
-                    return datetime.strptime(ts_str, '%Y-%m-%d %H:%M:%S')
-                
-                parts = ts_str.split()
-                
-                # Check if first part is a year (e.g., "2025 Nov 26 14:23:30")
-                if len(parts) >= 4 and parts[0].isdigit() and len(parts[0]) == 4:
-                    year = int(parts[0])
-                    month_abbr = parts[1]
-                    month_num = list(calendar.month_abbr).index(month_abbr)
-                    day = int(parts[2])
-                    time_part = parts[3]
-                    hour, minute, second = map(int, time_part.split(':'))
-                    return datetime(year, month_num, day, hour, minute, second)
-                
-                # Try syslog format (Nov 26 12:00:01)
-                current_year = datetime.now().year
-                month_abbr = parts[0]
-                month_num = list(calendar.month_abbr).index(month_abbr)
-                day = int(parts[1])
-                time_part = parts[2]
-                hour, minute, second = map(int, time_part.split(':'))
-                return datetime(current_year, month_num, day, hour, minute, second)
-            except Exception as e:
-                return None
-        
-        df['datetime'] = df['timestamp'].apply(parse_timestamp)
+        datetimes = _parse_timestamps(pd.Series([log.get("timestamp") for log in logs], dtype=object))
         
         # Drop rows with invalid timestamps
-        df_valid = df.dropna(subset=['datetime'])
+        valid = datetimes.notna().to_numpy()
         
-        if len(df_valid) == 0:
+        if not valid.any():
             # No valid timestamps, return empty time series
             return {
                 "total": len(logs),
@@ -140,118 +231,72 @@ def get_log_stats(host, time_range="1h"):
                 "time_series": [],
                 "filtered_total": len(logs),
                 "filtered_levels": level_counts
-            }
+            }, True
         
-        # Ensure datetime column is datetime type
-        df_valid['datetime'] = pd.to_datetime(df_valid['datetime'])
+        datetimes = datetimes[valid]
+        levels = levels[valid]
         
         # Determine time window and grouping based on time_range
-        now = datetime.now()
-        
         # Handle "all" time range - no filtering
         if time_range == "all":
-            cutoff = df_valid['datetime'].min()
-            max_time = df_valid['datetime'].max()
+            cutoff = datetimes.min()
+            max_time = datetimes.max()
             time_diff = max_time - cutoff
             
             # Choose appropriate grouping based on data range
-            if time_diff <= timedelta(hours=1):
-                time_format = '%H:%M'
-                delta = timedelta(minutes=1)
-            elif time_diff <= timedelta(days=1):
-                time_format = '%m/%d %H:00'
-                delta = timedelta(hours=1)
-            else:
-                time_format = '%m/%d'
-                delta = timedelta(days=1)
+            for name in ("1h", "1d", "1w"):
+                window, time_format, delta = _TIME_RANGES[name]
+                if time_diff <= window:
+                    break
             
             # Generate time slots from data range
-            all_time_slots = []
-            current_time = cutoff
-            while current_time <= max_time:
-                all_time_slots.append(current_time.strftime(time_format))
-                current_time += delta
-            
-            df_filtered = df_valid.copy()
+            all_time_slots = pd.date_range(cutoff, max_time, freq=delta).strftime(time_format).tolist()
         else:
-            if time_range == "1h":
-                cutoff = now - timedelta(hours=1)
-                time_format = '%H:%M'
-                delta = timedelta(minutes=1)
-            elif time_range == "1d":
-                cutoff = now - timedelta(days=1)
-                time_format = '%m/%d %H:00'
-                delta = timedelta(hours=1)
-            elif time_range == "1w":
-                cutoff = now - timedelta(weeks=1)
-                time_format = '%m/%d'
-                delta = timedelta(days=1)
-            elif time_range == "1m":
-                cutoff = now - timedelta(days=30)
-                time_format = '%m/%d'
-                delta = timedelta(days=1)
-            else:
-                cutoff = now - timedelta(hours=1)
-                time_format = '%H:%M'
-                delta = timedelta(minutes=1)
+            window, time_format, delta = _TIME_RANGES.get(time_range, _TIME_RANGES["1h"])
+            cutoff = now - window
             
             # Generate all time slots in the range
-            all_time_slots = []
-            current_time = cutoff
-            while current_time <= now:
-                all_time_slots.append(current_time.strftime(time_format))
-                current_time += delta
+            all_time_slots = pd.date_range(cutoff, now, freq=delta).strftime(time_format).tolist()
             
             # Filter logs by time range
-            df_filtered = df_valid[df_valid['datetime'] >= cutoff].copy()
+            in_range = (datetimes >= cutoff).to_numpy()
+            datetimes = datetimes[in_range]
+            levels = levels[in_range]
         
         # Calculate filtered totals and levels
-        filtered_total = len(df_filtered)
-        if len(df_filtered) > 0:
-            filtered_levels = df_filtered["level"].value_counts().to_dict()
-        else:
-            filtered_levels = {}
-        
-        # Group by time format
-        if len(df_filtered) > 0:
-            df_filtered['time_group'] = df_filtered['datetime'].dt.strftime(time_format)
-        
-            # Get all unique levels
-            all_levels = ['INFO', 'WARN', 'ERROR']
-            
-            # Group by time and level, count occurrences
-            grouped = df_filtered.groupby(['time_group', 'level']).size().reset_index(name='count')
-            # Pivot to create time-series format
-            pivot = grouped.pivot(index='time_group', columns='level', values='count').fillna(0)
-        else:
-            # Create empty pivot
-            pivot = pd.DataFrame(index=[], columns=['INFO', 'WARN', 'ERROR']).fillna(0)
+        filtered_total = len(levels)
+        filtered_levels = _count_levels(levels)
         
-        # Ensure all levels are present
-        for level in ['INFO', 'WARN', 'ERROR']:
-            if level not in pivot.columns:
-                pivot[level] = 0
+        # Time slot of each log by floor division of epoch nanoseconds, relative to the first slot
+        delta_ns = pd.Timedelta(delta).value
+        slot_idx = datetimes.to_numpy().astype(np.int64) // delta_ns - pd.Timestamp(cutoff).value // delta_ns
+        category_idx = [_SERIES_LEVELS.index(level) if level in _SERIES_LEVELS else -1 for level in levels.categories]
+        level_idx = np.array(category_idx + [-1], dtype=np.int64)[levels.codes]
         
-        # Reindex to include all time slots (fill missing with 0)
-        pivot = pivot.reindex(all_time_slots, fill_value=0)
+        # Count logs per (time slot, level) in one pass: key = slot * 3 + level column
+        counted = (slot_idx >= 0) & (slot_idx < len(all_time_slots)) & (level_idx >= 0)
+        keys = slot_idx[counted] * len(_SERIES_LEVELS) + level_idx[counted]
+        counts = np.bincount(keys, minlength=len(all_time_slots) * len(_SERIES_LEVELS))
+        counts = counts.reshape(len(all_time_slots), len(_SERIES_LEVELS))
         
         # Limit to reasonable number of data points by sampling
         max_points = 100
-        if len(pivot) > max_points:
-            step = len(pivot) // max_points
-            pivot = pivot.iloc[::step]
+        if len(all_time_slots) > max_points:
+            step = len(all_time_slots) // max_points
+            all_time_slots = all_time_slots[::step]
+            counts = counts[::step]
         
         # Convert to list of dicts for frontend
-        for time_str in pivot.index:
+        for time_str, row in zip(all_time_slots, counts.tolist()):
             entry = {"time": time_str}
-            for level in ['INFO', 'WARN', 'ERROR']:
-                entry[level] = int(pivot.loc[time_str, level])
+            entry.update(zip(_SERIES_LEVELS, row))
             time_series.append(entry)
             
     except Exception as e:
         print(f"Error creating time series: {e}")
         import traceback
         traceback.print_exc()
+        complete = False
     
     return {
         "total": len(logs),
@@ -259,4 +304,4 @@ def get_log_stats(host, time_range="1h"):
         "time_series": time_series,
         "filtered_total": filtered_total,
         "filtered_levels": filtered_levels
-    }
+    }, complete
@@ -1,12 +1,16 @@
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
 from pydantic import BaseModel
 from typing import List, Optional
+from concurrent.futures import ThreadPoolExecutor
+import asyncio
+import hashlib
 import os
 import json
 from pathlib import Path
 from dotenv import load_dotenv
-from log_reader import get_hosts, get_logs, get_log_stats
+from log_reader import get_hosts, get_logs, get_log_stats, get_host_signature, reset_parser
 from analyzer import analyze_logs
 from translator import translate_to_japanese
 from config_loader import get_config, reload_config
@@ -25,7 +29,12 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
-app = FastAPI()
+# orjson encodes large /logs and /stats payloads much faster than stdlib json
+app = FastAPI(default_response_class=ORJSONResponse)
+
+# Gemini and DeepL calls can block for seconds; they run on their own threads so
+# they don't hold the worker threads that serve /hosts, /logs and /stats
+upstream_executor = ThreadPoolExecutor(max_workers=32, thread_name_prefix="upstream")
 
 # Use CORS origins from config
 cors_origins = config.get_cors_origins() if config.get('server.cors.enabled', True) else []
@@ -52,6 +61,24 @@ class AnalysisRequest(BaseModel):
 class TranslationRequest(BaseModel):
     text: str
 
+def log_etag(host, *params):
+    """Build an ETag for a host's log responses, None if the host has no log files"""
+    signature = get_host_signature(host)
+    if not signature:
+        return None
+    digest = hashlib.blake2b(repr((signature, params)).encode(), digest_size=8).hexdigest()
+    return f'"{digest}"'
+
+def check_etag(request: Request, response: Response, etag):
+    """Attach validator headers; returns a 304 response if the client's copy is current"""
+    if etag is None:
+        return None
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers=headers)
+    response.headers.update(headers)
+    return None
+
 @app.get("/")
 def read_root():
     return {"message": "SIEM Backend is running"}
@@ -61,30 +88,40 @@ def list_hosts():
     return get_hosts()
 
 @app.get("/logs/{host}")
-def read_logs(host: str, limit: int = 100, offset: int = 0):
+def read_logs(host: str, request: Request, response: Response, limit: int = 100, offset: int = 0):
+    not_modified = check_etag(request, response, log_etag(host, limit, offset))
+    if not_modified:
+        return not_modified
     try:
         return get_logs(host, limit, offset)
     except FileNotFoundError:
         raise HTTPException(status_code=404, detail="Host not found")
 
 @app.get("/stats/{host}")
-def read_stats(host: str, time_range: str = "1h"):
+def read_stats(host: str, request: Request, response: Response, time_range: str = "1h"):
+    # Relative ranges move with the clock, so only "all" gets a validator
+    if time_range == "all":
+        not_modified = check_etag(request, response, log_etag(host, time_range))
+        if not_modified:
+            return not_modified
     try:
         return get_log_stats(host, time_range)
     except FileNotFoundError:
         raise HTTPException(status_code=404, detail="Host not found")
 
 @app.post("/analyze")
-def analyze_log_entries(request: AnalysisRequest):
+async def analyze_log_entries(request: AnalysisRequest):
     if not os.getenv("GEMINI_API_KEY"):
         raise HTTPException(status_code=500, detail="Gemini API Key not configured")
-    return analyze_logs(request.logs)
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(upstream_executor, analyze_logs, request.logs)
 
 @app.post("/translate")
-def translate_text(request: TranslationRequest):
+async def translate_text(request: TranslationRequest):
     if not os.getenv("DEEPL_API_KEY"):
         raise HTTPException(status_code=500, detail="DeepL API Key not configured")
-    result = translate_to_japanese(request.text)
+    loop = asyncio.get_running_loop()
+    result = await loop.run_in_executor(upstream_executor, translate_to_japanese, request.text)
     if "error" in result:
         raise HTTPException(status_code=500, detail=result["error"])
     return result
@@ -101,6 +138,7 @@ def reload_configuration():
     """Reload configuration from file"""
     try:
         reload_config()
+        reset_parser()
         logger.info("Configuration reloaded successfully")
         return {"message": "Configuration reloaded successfully"}
     except Exception as e:
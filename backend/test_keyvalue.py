@@ -1,4 +1,5 @@
 import re
+import timeit
 
 # Test key-value format pattern
 pattern = re.compile(
@@ -17,3 +18,15 @@ if match:
     print(f"  msg: {match.group(5)}")
 else:
     print("No match")
+
+# Benchmark matching over a realistic volume of lines
+N = 100_000
+lines = [line] * N
+elapsed = timeit.timeit(lambda: [pattern.match(l) for l in lines], number=1)
+print(f"Matched {N} lines in {elapsed:.3f}s ({elapsed / N * 1e9:.0f} ns/line)")
+
+# Same lines as one buffer: a single finditer call, no str object per line
+bulk_pattern = re.compile(pattern.pattern, re.MULTILINE)
+text = "\n".join(lines)
+elapsed = timeit.timeit(lambda: sum(1 for _ in bulk_pattern.finditer(text)), number=1)
+print(f"Scanned {N} lines with finditer in {elapsed:.3f}s ({elapsed / N * 1e9:.0f} ns/line)")
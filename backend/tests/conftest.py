@@ -1,67 +1,142 @@
 """
 Pytest fixtures for SIEM Log Management System tests
 """
+import copy
 import pytest
 import tempfile
 import os
+import shutil
+import yaml
 from pathlib import Path
 import sys
 
 # Add backend directory to path
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
+from log_parser import LogParser
+from config_loader import Config
 
-@pytest.fixture
+# Sample log file contents, one entry per line, written as-is by the fixtures below
+_SYSLOG_BYTES = b"\n".join([
+    b"Nov 26 12:00:01 host1 systemd[1]: Started Session 1 of user root.",
+    b"Nov 26 12:00:02 host1 sshd[1234]: Accepted publickey for user from 192.168.1.1",
+    b"Nov 26 12:00:03 host1 kernel: [12345.678901] Error: disk full",
+    b"Nov 26 12:00:04 host1 cron[5678]: Warning: job delayed",
+])
+
+_ISO_BYTES = b"\n".join([
+    b"2025-12-17T16:13:08+00:00 RHEL-FRONT tailscaled[926]: netcheck: UDP is blocked, trying HTTPS",
+    b"2025-12-17T16:13:09+00:00 RHEL-FRONT tailscaled[926]: Error connecting to server",
+    b"2025-12-17T16:13:10+00:00 RHEL-FRONT tailscaled[926]: Warning: connection slow",
+])
+
+_KV_BYTES = b"\n".join([
+    b"2025-12-17T23:00:19.900707+09:00 host=LOGS app=rsyslogd pid=- msg= rsyslogd's groupid changed to 104",
+    b"2025-12-17T23:00:20.123456+09:00 host=LOGS app=sshd pid=1234 msg= Connection established",
+    b"2025-12-17T23:00:21.234567+09:00 host=LOGS app=nginx pid=5678 msg= Error 502 bad gateway",
+])
+
+_HOST1_BYTES = b"\n".join([
+    b"Nov 26 12:00:01 host1 systemd[1]: Started Session 1 of user root.",
+    b"Nov 26 12:00:02 host1 sshd[1234]: Error: authentication failed",
+])
+
+_HOST2_BYTES = b"\n".join([
+    b"Nov 26 12:00:01 host2 nginx[999]: Started web server",
+    b"Nov 26 12:00:02 host2 nginx[999]: Warning: high load detected",
+])
+
+# Default configuration behind sample_config_dict and temp_config_file
+_SAMPLE_CONFIG = {
+    'logs': {
+        'base_dir': '',
+        'directories': ['./logs'],
+        'recursive': False,
+        'include_patterns': ['*'],
+        'exclude_patterns': ['*.gz', '*.zip'],
+        'max_file_size_mb': 100,
+        'host_detection': 'filename'
+    },
+    'server': {
+        'host': '0.0.0.0',
+        'port': 8000,
+        'reload': True,
+        'cors': {
+            'enabled': True,
+            'origins': ['http://localhost:5173']
+        }
+    },
+    'ai': {
+        'gemini': {
+            'model': 'gemini-2.0-flash-exp',
+            'max_tokens': 2048,
+            'temperature': 0.7
+        },
+        'max_logs_to_analyze': 50
+    },
+    'logging': {
+        'level': 'INFO',
+        'format': '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+    }
+}
+
+# Serialized once; libyaml's C emitter when PyYAML was built with it
+_SAMPLE_CONFIG_YAML = yaml.dump(_SAMPLE_CONFIG, Dumper=getattr(yaml, 'CSafeDumper', yaml.SafeDumper)).encode()
+
+
+def _write_file(path, data):
+    """Write bytes to a new file"""
+    with open(path, 'wb') as f:
+        f.write(data)
+
+
+@pytest.fixture(scope="session")
 def temp_log_dir():
-    """Create a temporary directory with sample log files"""
+    """Create a temporary directory with sample log files, shared read-only by all tests"""
     with tempfile.TemporaryDirectory() as tmpdir:
         # Create sample syslog format log file
-        syslog_content = """Nov 26 12:00:01 host1 systemd[1]: Started Session 1 of user root.
-Nov 26 12:00:02 host1 sshd[1234]: Accepted publickey for user from 192.168.1.1
-Nov 26 12:00:03 host1 kernel: [12345.678901] Error: disk full
-Nov 26 12:00:04 host1 cron[5678]: Warning: job delayed"""
-        
-        syslog_path = Path(tmpdir) / "syslog"
-        syslog_path.write_text(syslog_content)
+        _write_file(os.path.join(tmpdir, "syslog"), _SYSLOG_BYTES)
         
         # Create ISO 8601 format log file
-        iso_content = """2025-12-17T16:13:08+00:00 RHEL-FRONT tailscaled[926]: netcheck: UDP is blocked, trying HTTPS
-2025-12-17T16:13:09+00:00 RHEL-FRONT tailscaled[926]: Error connecting to server
-2025-12-17T16:13:10+00:00 RHEL-FRONT tailscaled[926]: Warning: connection slow"""
-        
-        iso_path = Path(tmpdir) / "messages"
-        iso_path.write_text(iso_content)
+        _write_file(os.path.join(tmpdir, "messages"), _ISO_BYTES)
         
         # Create key-value format log file
-        kv_content = """2025-12-17T23:00:19.900707+09:00 host=LOGS app=rsyslogd pid=- msg= rsyslogd's groupid changed to 104
-2025-12-17T23:00:20.123456+09:00 host=LOGS app=sshd pid=1234 msg= Connection established
-2025-12-17T23:00:21.234567+09:00 host=LOGS app=nginx pid=5678 msg= Error 502 bad gateway"""
-        
-        kv_path = Path(tmpdir) / "keyvalue.log"
-        kv_path.write_text(kv_content)
+        _write_file(os.path.join(tmpdir, "keyvalue.log"), _KV_BYTES)
         
         yield tmpdir
 
 
+@pytest.fixture(scope="session")
+def temp_log_parser(temp_log_dir):
+    """LogParser over temp_log_dir with the sample configuration, shared so its caches carry across tests"""
+    config = copy.deepcopy(_SAMPLE_CONFIG)
+    config['logs']['directories'] = [temp_log_dir]
+    return LogParser(Config(config))
+
+
+@pytest.fixture
+def mutable_log_dir(temp_log_dir, tmp_path):
+    """Copy of temp_log_dir for tests that add, change or touch files"""
+    log_dir = tmp_path / "logs"
+    shutil.copytree(temp_log_dir, log_dir)
+    return str(log_dir)
+
+
 @pytest.fixture
 def temp_log_dir_with_hosts():
     """Create a temporary directory with host subdirectories"""
     with tempfile.TemporaryDirectory() as tmpdir:
         # Create host1 directory
-        host1_dir = Path(tmpdir) / "host1"
-        host1_dir.mkdir()
+        host1_dir = os.path.join(tmpdir, "host1")
+        os.mkdir(host1_dir)
         
-        host1_log = host1_dir / "syslog"
-        host1_log.write_text("""Nov 26 12:00:01 host1 systemd[1]: Started Session 1 of user root.
-Nov 26 12:00:02 host1 sshd[1234]: Error: authentication failed""")
+        _write_file(os.path.join(host1_dir, "syslog"), _HOST1_BYTES)
         
         # Create host2 directory
-        host2_dir = Path(tmpdir) / "host2"
-        host2_dir.mkdir()
+        host2_dir = os.path.join(tmpdir, "host2")
+        os.mkdir(host2_dir)
         
-        host2_log = host2_dir / "syslog"
-        host2_log.write_text("""Nov 26 12:00:01 host2 nginx[999]: Started web server
-Nov 26 12:00:02 host2 nginx[999]: Warning: high load detected""")
+        _write_file(os.path.join(host2_dir, "syslog"), _HOST2_BYTES)
         
         yield tmpdir
 
@@ -69,64 +144,35 @@ Nov 26 12:00:02 host2 nginx[999]: Warning: high load detected""")
 @pytest.fixture
 def sample_config_dict():
     """Sample configuration dictionary"""
-    return {
-        'logs': {
-            'base_dir': '',
-            'directories': ['./logs'],
-            'recursive': False,
-            'include_patterns': ['*'],
-            'exclude_patterns': ['*.gz', '*.zip'],
-            'max_file_size_mb': 100,
-            'host_detection': 'filename'
-        },
-        'server': {
-            'host': '0.0.0.0',
-            'port': 8000,
-            'reload': True,
-            'cors': {
-                'enabled': True,
-                'origins': ['http://localhost:5173']
-            }
-        },
-        'ai': {
-            'gemini': {
-                'model': 'gemini-2.0-flash-exp',
-                'max_tokens': 2048,
-                'temperature': 0.7
-            },
-            'max_logs_to_analyze': 50
-        },
-        'logging': {
-            'level': 'INFO',
-            'format': '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-        }
-    }
+    return copy.deepcopy(_SAMPLE_CONFIG)
 
 
 @pytest.fixture
-def temp_config_file(sample_config_dict):
+def temp_config_file():
     """Create a temporary config file"""
-    import yaml
-    
     with tempfile.TemporaryDirectory() as tmpdir:
         config_path = Path(tmpdir) / "config.yaml"
-        with open(config_path, 'w') as f:
-            yaml.dump(sample_config_dict, f)
+        config_path.write_bytes(_SAMPLE_CONFIG_YAML)
         yield str(config_path)
 
 
 @pytest.fixture
 def mock_env_vars():
     """Context manager for mocking environment variables"""
-    original_env = os.environ.copy()
+    # Original value of each key set by the test, None if it was unset
+    saved = {}
     
     def set_env(**kwargs):
         for key, value in kwargs.items():
+            saved.setdefault(key, os.environ.get(key))
             os.environ[key] = value
     
     def cleanup():
-        os.environ.clear()
-        os.environ.update(original_env)
+        for key, value in saved.items():
+            if value is None:
+                os.environ.pop(key, None)
+            else:
+                os.environ[key] = value
     
     yield set_env
     cleanup()
@@ -0,0 +1,33 @@
+"""
+Tests for analyzer module
+"""
+import pytest
+import sys
+from pathlib import Path
+from unittest.mock import patch
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from analyzer import analyze_logs
+from config_loader import Config
+
+
+class TestAnalyzeLogs:
+    """Tests for analyze_logs function"""
+    
+    def test_logs_capped_at_max_logs_to_analyze(self, monkeypatch, sample_config_dict):
+        """Test only the first ai.max_logs_to_analyze logs reach the model"""
+        monkeypatch.setenv("GEMINI_API_KEY", "test-api-key")
+        sample_config_dict['ai']['max_logs_to_analyze'] = 3
+        logs = [f"log line {i}" for i in range(5)]
+        
+        with patch('analyzer.genai') as mock_genai, \
+             patch('analyzer.get_config', return_value=Config(sample_config_dict)):
+            generate_content = mock_genai.GenerativeModel.return_value.generate_content
+            generate_content.return_value.text = "Test analysis result"
+            
+            result = analyze_logs(logs)
+        
+        prompt = generate_content.call_args[0][0]
+        assert result == {"analysis": "Test analysis result"}
+        assert [line for line in logs if line in prompt] == logs[:3]
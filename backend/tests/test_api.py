@@ -4,18 +4,33 @@ Tests for FastAPI API endpoints
 import pytest
 import sys
 from pathlib import Path
-from fastapi.testclient import TestClient
 from unittest.mock import patch, MagicMock
 
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
-from main import app
+try:
+    from orjson import loads as _loads
+except ImportError:
+    from json import loads as _loads
 
 
-@pytest.fixture
-def client():
-    """Create test client"""
-    return TestClient(app)
+def _json(response):
+    """Decode a response body, with orjson when it is installed"""
+    return _loads(response.content)
+
+
+@pytest.fixture(scope="module")
+def main_module():
+    """Import the app module when a test first needs it, not at collection"""
+    import main
+    return main
+
+
+@pytest.fixture(scope="module")
+def client(main_module):
+    """Create test client shared by the tests in this module"""
+    from fastapi.testclient import TestClient
+    return TestClient(main_module.app)
 
 
 class TestRootEndpoint:
@@ -26,80 +41,124 @@ class TestRootEndpoint:
         response = client.get("/")
         
         assert response.status_code == 200
-        assert response.json() == {"message": "SIEM Backend is running"}
+        assert _json(response) == {"message": "SIEM Backend is running"}
 
 
 class TestHostsEndpoint:
     """Tests for /hosts endpoint"""
     
+    @pytest.fixture(autouse=True, scope="class")
+    def mock_get_hosts_patch(self, request):
+        """Patch main.get_hosts once for every test in the class"""
+        with patch('main.get_hosts') as mock:
+            request.cls.mock_get_hosts = mock
+            yield
+    
+    @pytest.fixture(autouse=True)
+    def reset_mock_get_hosts(self, mock_get_hosts_patch):
+        """Clear return values, side effects and calls left by the previous test"""
+        self.mock_get_hosts.reset_mock(return_value=True, side_effect=True)
+    
     def test_list_hosts(self, client):
         """Test listing hosts"""
-        with patch('main.get_hosts') as mock_get_hosts:
-            mock_get_hosts.return_value = ['host1', 'host2', 'host3']
-            
-            response = client.get("/hosts")
-            
-            assert response.status_code == 200
-            assert response.json() == ['host1', 'host2', 'host3']
+        self.mock_get_hosts.return_value = ['host1', 'host2', 'host3']
+        
+        response = client.get("/hosts")
+        
+        assert response.status_code == 200
+        assert _json(response) == ['host1', 'host2', 'host3']
     
     def test_list_hosts_empty(self, client):
         """Test listing hosts when none exist"""
-        with patch('main.get_hosts') as mock_get_hosts:
-            mock_get_hosts.return_value = []
-            
-            response = client.get("/hosts")
-            
-            assert response.status_code == 200
-            assert response.json() == []
+        self.mock_get_hosts.return_value = []
+        
+        response = client.get("/hosts")
+        
+        assert response.status_code == 200
+        assert _json(response) == []
+
+
+_MOCK_LOGS = [
+    {
+        'timestamp': '2025-12-20T10:00:00',
+        'level': 'INFO',
+        'message': 'Test log',
+        'process': 'test',
+        'service': 'test-service'
+    }
+]
 
 
 class TestLogsEndpoint:
     """Tests for /logs/{host} endpoint"""
     
-    def test_read_logs(self, client):
-        """Test reading logs for a host"""
-        mock_logs = [
-            {
-                'timestamp': '2025-12-20T10:00:00',
-                'level': 'INFO',
-                'message': 'Test log',
-                'process': 'test',
-                'service': 'test-service'
-            }
-        ]
-        
-        with patch('main.get_logs') as mock_get_logs:
-            mock_get_logs.return_value = mock_logs
-            
-            response = client.get("/logs/host1")
-            
-            assert response.status_code == 200
-            assert response.json() == mock_logs
+    @pytest.fixture(autouse=True, scope="class")
+    def mock_get_logs_patch(self, request):
+        """Patch main.get_logs and main.get_host_signature once for every test in the class"""
+        with patch('main.get_logs') as mock, patch('main.get_host_signature') as mock_signature:
+            request.cls.mock_get_logs = mock
+            request.cls.mock_get_host_signature = mock_signature
+            yield
     
-    def test_read_logs_with_limit_offset(self, client):
-        """Test reading logs with limit and offset parameters"""
-        with patch('main.get_logs') as mock_get_logs:
-            mock_get_logs.return_value = []
-            
-            response = client.get("/logs/host1?limit=50&offset=10")
-            
-            assert response.status_code == 200
-            mock_get_logs.assert_called_once_with('host1', 50, 10)
+    @pytest.fixture(autouse=True)
+    def reset_mock_get_logs(self, mock_get_logs_patch):
+        """Clear return values, side effects and calls left by the previous test"""
+        self.mock_get_logs.reset_mock(return_value=True, side_effect=True)
+        self.mock_get_host_signature.reset_mock(side_effect=True)
+        self.mock_get_host_signature.return_value = ()
     
-    def test_read_logs_not_found(self, client):
-        """Test reading logs for non-existent host"""
-        with patch('main.get_logs') as mock_get_logs:
-            mock_get_logs.side_effect = FileNotFoundError("Host not found")
-            
-            response = client.get("/logs/nonexistent")
-            
-            assert response.status_code == 404
-            assert "Host not found" in response.json()['detail']
+    @pytest.mark.parametrize("logs, error, url, expected_status, expected_call, expected_json", [
+        (_MOCK_LOGS, None, "/logs/host1", 200, ('host1', 100, 0), _MOCK_LOGS),
+        ([], None, "/logs/host1?limit=50&offset=10", 200, ('host1', 50, 10), []),
+        (None, FileNotFoundError("Host not found"), "/logs/nonexistent", 404, ('nonexistent', 100, 0), {"detail": "Host not found"}),
+    ], ids=["default", "limit_offset", "not_found"])
+    def test_read_logs(self, client, logs, error, url, expected_status, expected_call, expected_json):
+        """Test reading logs with default and explicit paging, and for non-existent hosts"""
+        self.mock_get_logs.return_value = logs
+        self.mock_get_logs.side_effect = error
+        
+        response = client.get(url)
+        
+        assert response.status_code == expected_status
+        assert _json(response) == expected_json
+        self.mock_get_logs.assert_called_once_with(*expected_call)
+    
+    def test_read_logs_not_modified(self, client):
+        """Test a matching If-None-Match skips reading logs until the files change"""
+        self.mock_get_host_signature.return_value = (('/var/log/host1', 1, 100),)
+        self.mock_get_logs.return_value = []
+        response = client.get("/logs/host1")
+        etag = response.headers['etag']
+        cached = client.get("/logs/host1", headers={'If-None-Match': etag})
+        
+        assert cached.status_code == 304
+        assert self.mock_get_logs.call_count == 1
+        
+        self.mock_get_host_signature.return_value = (('/var/log/host1', 2, 200),)
+        changed = client.get("/logs/host1", headers={'If-None-Match': etag})
+        
+        assert changed.status_code == 200
+        assert changed.headers['etag'] != etag
 
 
 class TestStatsEndpoint:
     """Tests for /stats/{host} endpoint"""
     
+    @pytest.fixture(autouse=True, scope="class")
+    def mock_get_stats_patch(self, request):
+        """Patch main.get_log_stats and main.get_host_signature once for every test in the class"""
+        with patch('main.get_log_stats') as mock, patch('main.get_host_signature') as mock_signature:
+            request.cls.mock_get_stats = mock
+            request.cls.mock_get_host_signature = mock_signature
+            yield
+    
+    @pytest.fixture(autouse=True)
+    def reset_mock_get_stats(self, mock_get_stats_patch):
+        """Clear return values, side effects and calls left by the previous test"""
+        self.mock_get_stats.reset_mock(return_value=True, side_effect=True)
+        self.mock_get_host_signature.reset_mock(side_effect=True)
+        self.mock_get_host_signature.return_value = ()
+    
     def test_read_stats(self, client):
         """Test reading stats for a host"""
         mock_stats = {
@@ -110,94 +169,92 @@ class TestStatsEndpoint:
             'filtered_levels': {'INFO': 40, 'WARN': 8, 'ERROR': 2}
         }
         
-        with patch('main.get_log_stats') as mock_get_stats:
-            mock_get_stats.return_value = mock_stats
-            
-            response = client.get("/stats/host1")
-            
-            assert response.status_code == 200
-            assert response.json()['total'] == 100
+        self.mock_get_stats.return_value = mock_stats
+        
+        response = client.get("/stats/host1")
+        
+        assert response.status_code == 200
+        assert _json(response)['total'] == 100
     
     def test_read_stats_with_time_range(self, client):
         """Test reading stats with time_range parameter"""
-        with patch('main.get_log_stats') as mock_get_stats:
-            mock_get_stats.return_value = {'total': 0, 'levels': {}, 'time_series': [], 'filtered_total': 0, 'filtered_levels': {}}
-            
-            response = client.get("/stats/host1?time_range=1d")
-            
-            assert response.status_code == 200
-            mock_get_stats.assert_called_once_with('host1', '1d')
+        self.mock_get_stats.return_value = {'total': 0, 'levels': {}, 'time_series': [], 'filtered_total': 0, 'filtered_levels': {}}
+        
+        response = client.get("/stats/host1?time_range=1d")
+        
+        assert response.status_code == 200
+        self.mock_get_stats.assert_called_once_with('host1', '1d')
     
     def test_read_stats_not_found(self, client):
         """Test reading stats for non-existent host"""
-        with patch('main.get_log_stats') as mock_get_stats:
-            mock_get_stats.side_effect = FileNotFoundError("Host not found")
-            
-            response = client.get("/stats/nonexistent")
-            
-            assert response.status_code == 404
+        self.mock_get_stats.side_effect = FileNotFoundError("Host not found")
+        
+        response = client.get("/stats/nonexistent")
+        
+        assert response.status_code == 404
+    
+    @pytest.mark.parametrize("time_range, expected_status", [
+        ("all", 304),
+        ("1h", 200),
+    ])
+    def test_read_stats_not_modified(self, client, time_range, expected_status):
+        """Test only "all" stats are validated, as relative ranges move with the clock"""
+        self.mock_get_host_signature.return_value = (('/var/log/host1', 1, 100),)
+        self.mock_get_stats.return_value = {'total': 0, 'levels': {}, 'time_series': [], 'filtered_total': 0, 'filtered_levels': {}}
+        url = f"/stats/host1?time_range={time_range}"
+        
+        etag = client.get(url).headers.get('etag')
+        cached = client.get(url, headers={'If-None-Match': etag or '"none"'})
+        
+        assert cached.status_code == expected_status
+        assert (etag is None) == (time_range != "all")
 
 
 class TestAnalyzeEndpoint:
     """Tests for /analyze endpoint"""
     
-    def test_analyze_without_api_key(self, client, monkeypatch):
-        """Test analyze endpoint without API key"""
-        monkeypatch.delenv("GEMINI_API_KEY", raising=False)
-        
-        response = client.post("/analyze", json={"logs": ["test log"]})
-        
-        assert response.status_code == 500
-        assert "API Key not configured" in response.json()['detail']
-    
-    def test_analyze_with_api_key(self, client, monkeypatch):
-        """Test analyze endpoint with API key"""
-        monkeypatch.setenv("GEMINI_API_KEY", "test-api-key")
+    @pytest.mark.parametrize("api_key, result, expected_status, expected_json", [
+        (None, None, 500, {"detail": "Gemini API Key not configured"}),
+        ("test-api-key", {"analysis": "Test analysis result"}, 200, {"analysis": "Test analysis result"}),
+    ], ids=["without_api_key", "with_api_key"])
+    def test_analyze(self, client, monkeypatch, api_key, result, expected_status, expected_json):
+        """Test analyze endpoint with and without API key"""
+        if api_key:
+            monkeypatch.setenv("GEMINI_API_KEY", api_key)
+        else:
+            monkeypatch.delenv("GEMINI_API_KEY", raising=False)
         
         with patch('main.analyze_logs') as mock_analyze:
-            mock_analyze.return_value = {"analysis": "Test analysis result"}
+            mock_analyze.return_value = result
             
             response = client.post("/analyze", json={"logs": ["test log 1", "test log 2"]})
-            
-            assert response.status_code == 200
-            assert response.json()['analysis'] == "Test analysis result"
+        
+        assert response.status_code == expected_status
+        assert _json(response) == expected_json
 
 
 class TestTranslateEndpoint:
     """Tests for /translate endpoint"""
     
-    def test_translate_without_api_key(self, client, monkeypatch):
-        """Test translate endpoint without API key"""
-        monkeypatch.delenv("DEEPL_API_KEY", raising=False)
-        
-        response = client.post("/translate", json={"text": "Hello world"})
-        
-        assert response.status_code == 500
-        assert "API Key not configured" in response.json()['detail']
-    
-    def test_translate_with_api_key(self, client, monkeypatch):
-        """Test translate endpoint with API key"""
-        monkeypatch.setenv("DEEPL_API_KEY", "test-api-key")
+    @pytest.mark.parametrize("api_key, result, expected_status, expected_json", [
+        (None, None, 500, {"detail": "DeepL API Key not configured"}),
+        ("test-api-key", {"translated_text": "こんにちは世界"}, 200, {"translated_text": "こんにちは世界"}),
+        ("test-api-key", {"error": "Translation failed"}, 500, {"detail": "Translation failed"}),
+    ], ids=["without_api_key", "with_api_key", "error"])
+    def test_translate(self, client, monkeypatch, api_key, result, expected_status, expected_json):
+        """Test translate endpoint with and without API key, and upstream errors"""
+        if api_key:
+            monkeypatch.setenv("DEEPL_API_KEY", api_key)
+        else:
+            monkeypatch.delenv("DEEPL_API_KEY", raising=False)
         
         with patch('main.translate_to_japanese') as mock_translate:
-            mock_translate.return_value = {"translated_text": "こんにちは世界"}
+            mock_translate.return_value = result
             
             response = client.post("/translate", json={"text": "Hello world"})
-            
-            assert response.status_code == 200
-            assert response.json()['translated_text'] == "こんにちは世界"
-    
-    def test_translate_error(self, client, monkeypatch):
-        """Test translate endpoint returns error properly"""
-        monkeypatch.setenv("DEEPL_API_KEY", "test-api-key")
         
-        with patch('main.translate_to_japanese') as mock_translate:
-            mock_translate.return_value = {"error": "Translation failed"}
-            
-            response = client.post("/translate", json={"text": "Hello"})
-            
-            assert response.status_code == 500
-            assert "Translation failed" in response.json()['detail']
+        assert response.status_code == expected_status
+        assert _json(response) == expected_json
 
 
 class TestConfigEndpoints:
@@ -208,7 +265,7 @@ class TestConfigEndpoints:
         response = client.get("/config/ui")
         
         assert response.status_code == 200
-        assert 'max_logs_to_display' in response.json()
+        assert 'max_logs_to_display' in _json(response)
     
     def test_reload_configuration(self, client):
         """Test reloading configuration"""
@@ -218,16 +275,18 @@ class TestConfigEndpoints:
             response = client.post("/config/reload")
             
             assert response.status_code == 200
-            assert "reloaded" in response.json()['message'].lower()
+            assert "reloaded" in _json(response)['message'].lower()
     
-    def test_reload_configuration_error(self, client):
+    def test_reload_configuration_error(self, main_module):
         """Test reloading configuration with error"""
         with patch('main.reload_config') as mock_reload:
             mock_reload.side_effect = Exception("Config file not found")
             
-            response = client.post("/config/reload")
+            # Routing is covered above; call the handler directly
+            with pytest.raises(main_module.HTTPException) as exc_info:
+                main_module.reload_configuration()
             
-            assert response.status_code == 500
+            assert exc_info.value.status_code == 500
 
 
 class TestCORS:
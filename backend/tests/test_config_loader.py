@@ -37,6 +37,19 @@ class TestConfig:
         assert config.get('logs.directories') == ['/custom/logs']
         assert config.get('server.port') == 9000
     
+    def test_config_partial_nested_override(self):
+        """Test nested overrides keep sibling defaults and leave the input untouched"""
+        override = {'server': {'cors': {'enabled': False}}, 'ai': {'gemini': {'model': 'custom'}}}
+
+        config = Config(override)
+
+        assert config.get('server.cors.enabled') == False
+        assert config.get('server.cors.origins') == ['http://localhost:5173', 'http://localhost:3000']
+        assert config.get('server.port') == 8000
+        assert config.get('ai.gemini.model') == 'custom'
+        assert config.get('ai.gemini.max_tokens') == 2048
+        assert override == {'server': {'cors': {'enabled': False}}, 'ai': {'gemini': {'model': 'custom'}}}
+    
     def test_config_get_with_dot_notation(self, sample_config_dict):
         """Test get method with dot notation"""
         config = Config(sample_config_dict)
@@ -52,6 +65,17 @@ class TestConfig:
         assert config.get('nonexistent.key', 'default') == 'default'
         assert config.get('logs.nonexistent', 42) == 42
     
+    def test_config_set_updates_get(self):
+        """Test set method is reflected by get, including parent sections"""
+        config = Config()
+
+        config.set('server.port', 9000)
+        config.set('ui.max_logs_to_display', 100)
+
+        assert config.get('server.port') == 9000
+        assert config.get('server')['port'] == 9000
+        assert config.get('ui.max_logs_to_display') == 100
+    
     def test_get_log_directories(self, sample_config_dict):
         """Test get_log_directories method"""
         config = Config(sample_config_dict)
@@ -128,6 +152,19 @@ class TestLoadConfig:
         assert isinstance(config, Config)
         assert config.get('logs.directories') == ['./logs']
     
+    def test_load_config_rereads_same_size_edit(self, temp_config_file):
+        """Test an edit keeping the file size and mtime is still picked up"""
+        load_config(temp_config_file)
+        
+        stat = os.stat(temp_config_file)
+        with open(temp_config_file, 'rb') as f:
+            data = f.read()
+        with open(temp_config_file, 'wb') as f:
+            f.write(data.replace(b'port: 8000', b'port: 8001'))
+        os.utime(temp_config_file, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+        
+        assert load_config(temp_config_file).get('server.port') == 8001
+    
     def test_load_config_missing_file(self):
         """Test loading config when file doesn't exist"""
         config = load_config('/nonexistent/path/config.yaml')
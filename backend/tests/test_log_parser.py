@@ -2,6 +2,7 @@
 Tests for log_parser module
 """
 import pytest
+import os
 import tempfile
 from pathlib import Path
 import sys
@@ -62,6 +63,22 @@ class TestLogParserPatterns:
         assert pid == "-"
         assert "groupid changed" in message
 
+    def test_combined_pattern_dispatch(self, parser):
+        """Test combined pattern selects the same format as the individual patterns"""
+        lines = {
+            "2025-12-17T16:13:08+00:00 RHEL-FRONT tailscaled[926]: netcheck": 'iso8601',
+            "2025-12-17T23:00:19.900707+09:00 host=LOGS app=rsyslogd pid=- msg= hello": 'keyvalue',
+            "Nov 26 12:00:01 host1 systemd[1]: Started Session 1": 'syslog',
+            "2024-01-01 12:00:00 INFO app: started": 'iso',
+        }
+
+        for line, expected in lines.items():
+            match = parser.combined_pattern.match(line)
+            assert match is not None
+            assert match.lastgroup == expected
+
+        assert parser.combined_pattern.match("This is not a log line") is None
+
 
 class TestParseProcessAndLevel:
     """Tests for _parse_process_and_level method"""
@@ -87,6 +104,21 @@ class TestParseProcessAndLevel:
         assert pid is None
         assert level == "WARN"
     
+    def test_parse_process_without_brackets(self, parser):
+        """Test process string without brackets is returned unchanged"""
+        process, pid, level = parser._parse_process_and_level("kernel", "Device ready")
+
+        assert process == "kernel"
+        assert pid is None
+        assert level == "INFO"
+
+    def test_parse_process_splits_at_first_bracket(self, parser):
+        """Test only the first bracket starts the pid/level part"""
+        process, pid, level = parser._parse_process_and_level("app[worker][7]", "Started")
+
+        assert process == "app"
+        assert pid is None
+
     def test_parse_process_error_from_message(self, parser):
         """Test error level detection from message content"""
         process, pid, level = parser._parse_process_and_level("kernel", "Error: disk full")
@@ -94,6 +126,12 @@ class TestParseProcessAndLevel:
         assert process == "kernel"
         assert level == "ERROR"
     
+    def test_parse_process_debug_in_message_is_info(self, parser):
+        """Test syslog messages mentioning debug stay INFO"""
+        process, pid, level = parser._parse_process_and_level("kernel", "debugfs mounted")
+        
+        assert level == "INFO"
+    
     def test_parse_process_warn_from_message(self, parser):
         """Test warning level detection from message content"""
         process, pid, level = parser._parse_process_and_level("app", "Warning: high memory usage")
@@ -103,19 +141,24 @@ class TestParseProcessAndLevel:
     def test_parse_process_fail_keyword(self, parser):
         """Test error level detection from 'fail' keyword"""
         process, pid, level = parser._parse_process_and_level("sshd", "Authentication failed")
-        
+
         assert level == "ERROR"
 
+    def test_detect_level_precedence(self, parser):
+        """Test error keywords take precedence over earlier warn/debug keywords"""
+        assert parser._detect_level("Warning: retry failed") == "ERROR"
+        assert parser._detect_level("DEBUG: warn threshold reached") == "WARN"
+        assert parser._detect_level("Debug output enabled") == "DEBUG"
+        assert parser._detect_level("Started service") == "INFO"
+
 
 class TestParseLogFile:
     """Tests for parse_log_file method"""
     
     @pytest.fixture
-    def parser_with_dir(self, temp_log_dir, sample_config_dict):
-        """Create LogParser with temp directory"""
-        sample_config_dict['logs']['directories'] = [temp_log_dir]
-        config = Config(sample_config_dict)
-        return LogParser(config), temp_log_dir
+    def parser_with_dir(self, temp_log_parser, temp_log_dir):
+        """Shared LogParser with its temp directory"""
+        return temp_log_parser, temp_log_dir
     
     def test_parse_syslog_file(self, parser_with_dir):
         """Test parsing syslog format file"""
@@ -168,6 +211,53 @@ class TestParseLogFile:
         
         assert logs == []
 
+    def test_parse_cache_invalidated_on_change(self, mutable_log_dir, sample_config_dict):
+        """Test cached entries are reused until the file changes"""
+        sample_config_dict['logs']['directories'] = [mutable_log_dir]
+        parser = LogParser(Config(sample_config_dict))
+        file_path = Path(mutable_log_dir) / "syslog"
+
+        logs = parser.parse_log_file(file_path)
+        assert parser.parse_log_file(file_path) is logs
+
+        with open(file_path, 'a') as f:
+            f.write("\nNov 26 12:00:05 host1 cron[5678]: Job finished")
+
+        updated = parser.parse_log_file(file_path)
+        assert len(updated) == len(logs) + 1
+
+    def test_file_grown_past_size_limit_skipped(self, mutable_log_dir, sample_config_dict):
+        """Test a file in the cached file list is skipped once it grows past max_file_size_mb"""
+        sample_config_dict['logs']['directories'] = [mutable_log_dir]
+        sample_config_dict['logs']['max_file_size_mb'] = 1
+        parser = LogParser(Config(sample_config_dict))
+
+        assert len(parser.get_logs_for_host("syslog")) > 0
+
+        with open(Path(mutable_log_dir) / "syslog", 'a') as f:
+            f.write("\nNov 26 12:00:05 host1 cron[5678]: padding" * 30000)
+
+        assert "syslog" in parser.get_all_hosts()
+        assert parser.get_logs_for_host("syslog") == []
+        assert parser.get_stats_for_host("syslog")['total'] == 0
+
+    def test_parse_cache_bounded(self, temp_log_dir, sample_config_dict, monkeypatch):
+        """Test least recently used files are dropped once the cache holds too many entries"""
+        sample_config_dict['logs']['directories'] = [temp_log_dir]
+        parser = LogParser(Config(sample_config_dict))
+        syslog, iso, kv = (Path(temp_log_dir) / name for name in ("syslog", "messages", "keyvalue.log"))
+        # Room for the syslog and key-value files (4 + 3 entries), but not all three
+        monkeypatch.setattr('log_parser._PARSE_CACHE_MAX_ENTRIES', 7)
+
+        logs = parser.parse_log_file(syslog)
+        parser.parse_log_file(iso)
+        parser.parse_log_file(syslog)
+        parser.parse_log_file(kv)
+
+        assert list(parser._parse_cache) == [syslog, kv]
+        assert parser._parse_cache_entries == 7
+        assert parser.parse_log_file(syslog) is logs
+
 
 class TestFindLogFiles:
     """Tests for find_log_files method"""
@@ -187,13 +277,13 @@ class TestFindLogFiles:
         
         assert len(all_files) >= 3  # syslog, messages, keyvalue.log
     
-    def test_exclude_patterns(self, temp_log_dir, sample_config_dict):
+    def test_exclude_patterns(self, mutable_log_dir, sample_config_dict):
         """Test that exclude patterns work"""
         # Create a .gz file that should be excluded
-        gz_path = Path(temp_log_dir) / "archive.log.gz"
+        gz_path = Path(mutable_log_dir) / "archive.log.gz"
         gz_path.write_text("compressed data")
         
-        sample_config_dict['logs']['directories'] = [temp_log_dir]
+        sample_config_dict['logs']['directories'] = [mutable_log_dir]
         sample_config_dict['logs']['exclude_patterns'] = ['*.gz']
         config = Config(sample_config_dict)
         parser = LogParser(config)
@@ -208,6 +298,30 @@ class TestFindLogFiles:
         gz_files = [f for f in all_files if str(f).endswith('.gz')]
         assert len(gz_files) == 0
     
+    def test_include_patterns(self, temp_log_dir, sample_config_dict):
+        """Test that only files matching an include pattern are returned"""
+        sample_config_dict['logs']['directories'] = [temp_log_dir]
+        sample_config_dict['logs']['include_patterns'] = ['*.log', 'sys*']
+        config = Config(sample_config_dict)
+        parser = LogParser(config)
+
+        log_files = parser.find_log_files()
+
+        names = sorted(f.name for files in log_files.values() for f in files)
+        assert names == ['keyvalue.log', 'syslog']
+
+    def test_patterns_follow_normcase(self, temp_log_dir, sample_config_dict, monkeypatch):
+        """Test patterns match case-insensitively where os.path.normcase folds case, as on Windows"""
+        monkeypatch.setattr('log_parser.os.path.normcase', str.lower)
+        sample_config_dict['logs']['directories'] = [temp_log_dir]
+        sample_config_dict['logs']['include_patterns'] = ['*.LOG', 'SYS*']
+        parser = LogParser(Config(sample_config_dict))
+
+        log_files = parser.find_log_files()
+
+        names = sorted(f.name for files in log_files.values() for f in files)
+        assert names == ['keyvalue.log', 'syslog']
+
     def test_recursive_scan(self, temp_log_dir_with_hosts, sample_config_dict):
         """Test recursive directory scanning"""
         sample_config_dict['logs']['directories'] = [temp_log_dir_with_hosts]
@@ -221,6 +335,58 @@ class TestFindLogFiles:
         # Should find files in subdirectories with host names
         assert 'host1' in log_files or 'host2' in log_files
 
+    def test_find_files_cache_invalidated(self, mutable_log_dir, sample_config_dict, monkeypatch):
+        """Test cached file list is refreshed when the directory changes"""
+        monkeypatch.setattr('log_parser._FILES_CACHE_TTL', 0)
+        sample_config_dict['logs']['directories'] = [mutable_log_dir]
+        config = Config(sample_config_dict)
+        parser = LogParser(config)
+
+        log_files = parser.find_log_files()
+        assert parser.find_log_files() is log_files
+
+        new_log = Path(mutable_log_dir) / "newhost.log"
+        new_log.write_text("Nov 26 12:00:01 newhost systemd[1]: Started")
+        # Force a distinct directory mtime regardless of timestamp granularity
+        stat = os.stat(mutable_log_dir)
+        os.utime(mutable_log_dir, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+        assert 'newhost' in parser.find_log_files()
+
+    def test_find_files_cache_invalidated_nested(self, tmp_path, sample_config_dict, monkeypatch):
+        """Test a file added two levels below a log directory is found in recursive mode"""
+        monkeypatch.setattr('log_parser._FILES_CACHE_TTL', 0)
+        nested_dir = tmp_path / "host1" / "sub"
+        nested_dir.mkdir(parents=True)
+        sample_config_dict['logs']['directories'] = [str(tmp_path)]
+        sample_config_dict['logs']['recursive'] = True
+        sample_config_dict['logs']['host_detection'] = 'directory'
+        parser = LogParser(Config(sample_config_dict))
+
+        assert parser.find_log_files() == {}
+
+        (nested_dir / "syslog").write_text("Nov 26 12:00:01 host1 systemd[1]: Started")
+        stat = os.stat(nested_dir)
+        os.utime(nested_dir, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+        assert 'sub' in parser.find_log_files()
+
+    def test_find_files_mtimes_checked_once_per_ttl(self, temp_log_dir, sample_config_dict, monkeypatch):
+        """Test directories are walked once while the cached file list is within its TTL"""
+        sample_config_dict['logs']['directories'] = [temp_log_dir]
+        parser = LogParser(Config(sample_config_dict))
+        walks = []
+        get_directory_mtimes = parser._get_directory_mtimes
+        monkeypatch.setattr(parser, '_get_directory_mtimes', lambda *args: walks.append(args) or get_directory_mtimes(*args))
+
+        log_files = parser.find_log_files()
+        assert parser.find_log_files() is log_files
+        assert len(walks) == 1
+
+        monkeypatch.setattr('log_parser._FILES_CACHE_TTL', 0)
+        assert parser.find_log_files() is log_files
+        assert len(walks) == 2
+
 
 class TestGetHostName:
     """Tests for _get_host_name method"""
@@ -277,11 +443,9 @@ class TestGetHostName:
 class TestGetLogsForHost:
     """Tests for get_logs_for_host method"""
     
-    def test_get_logs_for_existing_host(self, temp_log_dir, sample_config_dict):
+    def test_get_logs_for_existing_host(self, temp_log_parser):
         """Test getting logs for an existing host"""
-        sample_config_dict['logs']['directories'] = [temp_log_dir]
-        config = Config(sample_config_dict)
-        parser = LogParser(config)
+        parser = temp_log_parser
         
         # Find available hosts first
         hosts = parser.get_all_hosts()
@@ -289,20 +453,32 @@ class TestGetLogsForHost:
             logs = parser.get_logs_for_host(hosts[0], limit=10)
             assert isinstance(logs, list)
     
-    def test_get_logs_for_nonexistent_host(self, temp_log_dir, sample_config_dict):
+    def test_get_logs_for_nonexistent_host(self, temp_log_parser):
         """Test getting logs for a non-existent host"""
-        sample_config_dict['logs']['directories'] = [temp_log_dir]
-        config = Config(sample_config_dict)
-        parser = LogParser(config)
+        parser = temp_log_parser
         
         logs = parser.get_logs_for_host("nonexistent_host", limit=10)
         assert logs == []
     
-    def test_get_logs_pagination(self, temp_log_dir, sample_config_dict):
-        """Test logs pagination with limit and offset"""
-        sample_config_dict['logs']['directories'] = [temp_log_dir]
+    def test_get_logs_multiple_files(self, temp_log_dir_with_hosts, sample_config_dict):
+        """Test logs from several files of one host are merged"""
+        extra_log = Path(temp_log_dir_with_hosts) / "host1" / "messages"
+        extra_log.write_text("2025-12-17T16:13:08+00:00 host1 tailscaled[926]: netcheck done")
+
+        sample_config_dict['logs']['directories'] = [temp_log_dir_with_hosts]
+        sample_config_dict['logs']['recursive'] = True
+        sample_config_dict['logs']['host_detection'] = 'directory'
         config = Config(sample_config_dict)
         parser = LogParser(config)
+
+        logs = parser.get_logs_for_host("host1", limit=10)
+
+        assert len(logs) == 3
+        assert {Path(log['file']).name for log in logs} == {'syslog', 'messages'}
+
+    def test_get_logs_pagination(self, temp_log_parser):
+        """Test logs pagination with limit and offset"""
+        parser = temp_log_parser
         
         hosts = parser.get_all_hosts()
         if hosts:
@@ -319,11 +495,9 @@ class TestGetLogsForHost:
 class TestGetAllHosts:
     """Tests for get_all_hosts method"""
     
-    def test_get_all_hosts(self, temp_log_dir, sample_config_dict):
+    def test_get_all_hosts(self, temp_log_parser):
         """Test getting all available hosts"""
-        sample_config_dict['logs']['directories'] = [temp_log_dir]
-        config = Config(sample_config_dict)
-        parser = LogParser(config)
+        parser = temp_log_parser
         
         hosts = parser.get_all_hosts()
         
@@ -346,11 +520,9 @@ class TestGetAllHosts:
 class TestGetStatsForHost:
     """Tests for get_stats_for_host method"""
     
-    def test_get_stats_for_host(self, temp_log_dir, sample_config_dict):
+    def test_get_stats_for_host(self, temp_log_parser):
         """Test getting stats for a host"""
-        sample_config_dict['logs']['directories'] = [temp_log_dir]
-        config = Config(sample_config_dict)
-        parser = LogParser(config)
+        parser = temp_log_parser
         
         hosts = parser.get_all_hosts()
         if hosts:
@@ -362,11 +534,35 @@ class TestGetStatsForHost:
             assert 'error' in stats
             assert stats['total'] >= 0
     
-    def test_get_stats_for_nonexistent_host(self, temp_log_dir, sample_config_dict):
-        """Test getting stats for non-existent host"""
+    def test_stats_match_parsed_levels(self, temp_log_dir, sample_config_dict):
+        """Test counting without parsing gives the same levels as a full parse"""
         sample_config_dict['logs']['directories'] = [temp_log_dir]
         config = Config(sample_config_dict)
-        parser = LogParser(config)
+
+        for host in LogParser(config).get_all_hosts():
+            stats = LogParser(config).get_stats_for_host(host)
+            logs = LogParser(config).get_logs_for_host(host, limit=10000)
+
+            assert stats['total'] == len(logs)
+            for level in ['INFO', 'WARN', 'ERROR', 'DEBUG']:
+                assert stats[level.lower()] == sum(1 for log in logs if log['level'] == level)
+    
+    def test_stats_summed_over_host_files(self, temp_log_dir, sample_config_dict):
+        """Test levels are summed over every file of a host with several files"""
+        sample_config_dict['logs']['directories'] = [temp_log_dir]
+        sample_config_dict['logs']['host_detection'] = 'directory'
+        parser = LogParser(Config(sample_config_dict))
+        
+        host, file_paths = next(iter(parser.find_log_files().items()))
+        stats = parser.get_stats_for_host(host)
+        
+        assert len(file_paths) == 3
+        assert stats['total'] == sum(len(parser.parse_log_file(path)) for path in file_paths)
+        assert stats['error'] == 3
+    
+    def test_get_stats_for_nonexistent_host(self, temp_log_parser):
+        """Test getting stats for non-existent host"""
+        parser = temp_log_parser
         
         stats = parser.get_stats_for_host("nonexistent_host")
         
@@ -7,7 +7,7 @@ from pathlib import Path
 
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
-from log_reader import parse_syslog_line, get_log_stats
+from log_reader import parse_syslog_line, get_log_stats, get_parser, reset_parser
 
 
 class TestParseSyslogLine:
@@ -89,6 +89,12 @@ class TestParseSyslogLine:
 class TestGetLogStats:
     """Tests for get_log_stats function with mock data"""
     
+    @pytest.fixture(autouse=True)
+    def isolate_stats(self, monkeypatch):
+        """Keep tests off the configured log directories and each other's cached stats"""
+        monkeypatch.setattr('log_reader.get_host_signature', lambda host: ())
+        monkeypatch.setattr('log_reader._stats_cache', {})
+    
     def test_stats_empty_logs(self, monkeypatch):
         """Test stats for empty logs"""
         # Mock get_logs to return empty list
@@ -145,3 +151,90 @@ class TestGetLogStats:
         
         assert stats['total'] == 2
         assert 'levels' in stats
+    
+    def test_stats_mixed_timestamp_formats(self, monkeypatch):
+        """Test ISO offsets are converted to JST and share buckets with syslog timestamps"""
+        mock_logs = [
+            {'timestamp': '2025-12-20T01:00:10+00:00', 'level': 'INFO', 'message': 'Test'},
+            {'timestamp': '2025 Dec 20 10:00:30', 'level': 'ERROR', 'message': 'Error'},
+            {'timestamp': 'invalid-timestamp', 'level': 'INFO', 'message': 'Test'},
+        ]
+        
+        monkeypatch.setattr('log_reader.get_logs', lambda host, limit: mock_logs)
+        
+        stats = get_log_stats("test_host", "all")
+        
+        assert stats['filtered_total'] == 2
+        assert stats['time_series'] == [{'time': '10:00', 'INFO': 1, 'WARN': 0, 'ERROR': 1}]
+    
+    def test_stats_timestamp_cache_overflow(self, monkeypatch):
+        """Test timestamps are still parsed when they do not fit in the timestamp cache"""
+        mock_logs = [
+            {'timestamp': f'2025 Dec 20 10:00:0{i}', 'level': 'INFO', 'message': 'Test'}
+            for i in range(3)
+        ]
+        
+        monkeypatch.setattr('log_reader._TIMESTAMP_CACHE_SIZE', 1)
+        monkeypatch.setattr('log_reader.get_logs', lambda host, limit: mock_logs)
+        
+        stats = get_log_stats("test_host", "all")
+        
+        assert stats['filtered_total'] == 3
+        assert stats['time_series'] == [{'time': '10:00', 'INFO': 3, 'WARN': 0, 'ERROR': 0}]
+    
+    def test_stats_cached_until_log_files_change(self, monkeypatch):
+        """Test stats are reused for the same log file signature and recomputed when it changes"""
+        calls = []
+        
+        def fake_get_logs(host, limit):
+            calls.append(host)
+            return [{'timestamp': '2025 Dec 20 10:00:00', 'level': 'INFO', 'message': 'Test'}]
+        
+        signature = [(('syslog', 1, 100),)]
+        monkeypatch.setattr('log_reader.get_logs', fake_get_logs)
+        monkeypatch.setattr('log_reader.get_host_signature', lambda host: signature[0])
+        
+        first = get_log_stats("cached_host", "all")
+        first['total'] = 0
+        second = get_log_stats("cached_host", "all")
+        
+        assert len(calls) == 1
+        assert second['total'] == 1
+        
+        signature[0] = (('syslog', 2, 200),)
+        get_log_stats("cached_host", "all")
+        
+        assert len(calls) == 2
+    
+    def test_stats_not_cached_after_time_series_error(self, monkeypatch):
+        """Test stats from a failed time-series build are recomputed on the next call"""
+        import log_reader
+        parse_timestamps = log_reader._parse_timestamps
+        failures = [RuntimeError("boom")]
+        
+        def flaky_parse_timestamps(timestamps):
+            if failures:
+                raise failures.pop()
+            return parse_timestamps(timestamps)
+        
+        mock_logs = [{'timestamp': '2025 Dec 20 10:00:00', 'level': 'INFO', 'message': 'Test'}]
+        monkeypatch.setattr('log_reader.get_logs', lambda host, limit: mock_logs)
+        monkeypatch.setattr('log_reader.get_host_signature', lambda host: (('syslog', 1, 100),))
+        monkeypatch.setattr('log_reader._parse_timestamps', flaky_parse_timestamps)
+        
+        assert get_log_stats("flaky_host", "all")['time_series'] == []
+        assert len(get_log_stats("flaky_host", "all")['time_series']) == 1
+
+
+class TestGetParser:
+    """Tests for the shared LogParser"""
+    
+    def test_parser_reused_until_reset(self):
+        """Test the parser instance is shared until reset_parser is called"""
+        parser = get_parser()
+        
+        assert get_parser() is parser
+        
+        reset_parser()
+        
+        assert get_parser() is not parser
@@ -0,0 +1,60 @@
+"""
+Tests for translator module
+"""
+import pytest
+import sys
+from pathlib import Path
+from unittest.mock import patch, MagicMock
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import translator
+from translator import translate_to_japanese
+
+
+class TestTranslateToJapanese:
+    """Tests for translate_to_japanese function"""
+    
+    @pytest.fixture(autouse=True)
+    def mock_translator_class(self, monkeypatch):
+        """Patch deepl.Translator and start each test with empty client and translation caches"""
+        monkeypatch.setenv("DEEPL_API_KEY", "test-api-key")
+        translator._get_translator.cache_clear()
+        translator._translate.cache_clear()
+        with patch('translator.deepl.Translator') as mock:
+            mock.return_value.translate_text.side_effect = lambda text, target_lang: MagicMock(text=f"ja:{text}")
+            self.mock_translator = mock
+            yield
+        translator._get_translator.cache_clear()
+        translator._translate.cache_clear()
+    
+    def test_client_reused(self):
+        """Test one DeepL client is built for repeated calls"""
+        translate_to_japanese("Hello")
+        translate_to_japanese("World")
+        
+        self.mock_translator.assert_called_once_with("test-api-key")
+    
+    def test_same_text_translated_once(self):
+        """Test repeated text is served from the translation cache"""
+        first = translate_to_japanese("Hello")
+        second = translate_to_japanese("Hello")
+        
+        assert first == second == {"translated_text": "ja:Hello"}
+        self.mock_translator.return_value.translate_text.assert_called_once_with("Hello", target_lang="JA")
+    
+    def test_error_not_cached(self):
+        """Test a failed translation is retried on the next call"""
+        translate_text = self.mock_translator.return_value.translate_text
+        translate_text.side_effect = [Exception("Quota exceeded"), MagicMock(text="ja:Hello")]
+        
+        assert translate_to_japanese("Hello") == {"error": "Quota exceeded"}
+        assert translate_to_japanese("Hello") == {"translated_text": "ja:Hello"}
+        assert translate_text.call_count == 2
+    
+    def test_missing_api_key(self, monkeypatch):
+        """Test an error is returned without calling DeepL when the API key is missing"""
+        monkeypatch.delenv("DEEPL_API_KEY")
+        
+        assert translate_to_japanese("Hello") == {"error": "DeepL API Key missing"}
+        self.mock_translator.assert_not_called()
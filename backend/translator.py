@@ -1,15 +1,24 @@
 import deepl
 import os
+from functools import lru_cache
+
+@lru_cache(maxsize=1)
+def _get_translator(api_key):
+    """DeepL client reused across calls so its HTTPS connection is kept alive"""
+    return deepl.Translator(api_key)
+
+@lru_cache(maxsize=4096)
+def _translate(api_key, text):
+    """Translate one text, memoized since the same log messages are translated repeatedly"""
+    return _get_translator(api_key).translate_text(text, target_lang="JA").text
 
 def translate_to_japanese(text):
     """Translate text to Japanese using DeepL API"""
     api_key = os.getenv("DEEPL_API_KEY")
     if not api_key:
         return {"error": "DeepL API Key missing"}
-    
+
     try:
-        translator = deepl.Translator(api_key)
-        result = translator.translate_text(text, target_lang="JA")
-        return {"translated_text": result.text}
+        return {"translated_text": _translate(api_key, text)}
     except Exception as e:
         return {"error": str(e)}